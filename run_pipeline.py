@@ -9,6 +9,12 @@ import argparse
 import asyncio
 import os
 import sys
+
+try:
+    import uvloop
+except ImportError:  # uvloop doesn't support Windows; fall back to the default loop
+    uvloop = None
+
 from scripts.utils.db_config import format_connection_string
 from scripts.pipeline import run_pipeline
 
@@ -25,6 +31,26 @@ def parse_args():
     db_group.add_argument("--db-name", help="Database name")
     db_group.add_argument("--db-user", help="Database username")
     db_group.add_argument("--db-password", help="Database password")
+    db_group.add_argument(
+        "--connection-limit",
+        type=int,
+        help="Size of Prisma's connection pool (default: Prisma's, 2 x CPUs + 1). "
+             "Keep it at or below the database's max_connections"
+    )
+    db_group.add_argument(
+        "--pool-timeout",
+        type=int,
+        help="Seconds a query waits for a free pooled connection; 0 waits indefinitely "
+             "(default: Prisma's, 10)"
+    )
+    
+    # Loading options
+    load_group = parser.add_argument_group("Loading")
+    load_group.add_argument(
+        "--skip-index-management",
+        action="store_true",
+        help="Keep secondary indexes in place during the load instead of dropping and rebuilding them"
+    )
     
     return parser.parse_args()
 
@@ -55,9 +81,16 @@ def main():
         )
         os.environ["DATABASE_URL"] = connection_url
     
-    # Run the pipeline
+    # Run the pipeline on uvloop where available; every Prisma query goes through the event loop
+    if uvloop is not None:
+        uvloop.install()
+    
     try:
-        asyncio.run(run_pipeline())
+        asyncio.run(run_pipeline(
+            manage_indexes=not args.skip_index_management,
+            connection_limit=args.connection_limit,
+            pool_timeout=args.pool_timeout
+        ))
         return 0
     except Exception as e:
         print(f"Pipeline execution failed: {str(e)}", file=sys.stderr)
@@ -17,24 +17,26 @@ The script extracts the following columns:
 - gpu_memory: GPU memory in GiB (double)
 - os_type: Operating system type - WINDOWS, LINUX, OTHER (enum)
 - region: AWS region mapped to continent - north_america, south_america, europe, asia, africa, oceania, antarctica (enum)
-- other_details: All VM information from pricing API and EC2 API in JSON format (string)
+- other_details: All VM information from pricing API and EC2 API in JSON format (string),
+  except the instance type, vCPU count and architecture already stored in their own columns
 
 USAGE:
-    python3 scripts/aws_ondemand_vm_pricing.py [--max-records N]
+    python3 scripts/aws_ondemand_vm_pricing.py [--max-records N] [--fetch-workers N]
     
     Options:
         --max-records N    Limit processing to N records (default: no limit)
+        --fetch-workers N  Number of regions fetched concurrently (default: 8)
 
 REQUIREMENTS:
     - AWS credentials configured (via AWS CLI, environment variables, or IAM role)
-    - boto3 library installed
+    - boto3 and orjson libraries installed
     - Internet connection for AWS Pricing API and EC2 API access
-    - IAM permissions: pricing:GetProducts, ec2:DescribeInstanceTypes
+    - IAM permissions: pricing:GetProducts, pricing:GetAttributeValues, ec2:DescribeInstanceTypes
 
 OUTPUT:
     - Timestamped CSV file: data/aws_ondemand_vm_pricing_YYYYMMDD_HHMMSS.csv
     - New file created each time the script runs with current timestamp
-    - Progress summaries written every 100 pages
+    - Progress summaries written at most every 30 seconds
 
 FILTERS APPLIED:
     - API-level filter: productFamily = "Compute Instance"
@@ -53,11 +55,16 @@ ASSUMPTIONS:
 """
 
 import boto3
-import json
+import orjson
 import csv
 import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 import re
 import os
 from pathlib import Path
@@ -166,12 +173,136 @@ AWS_REGION_TO_CONTINENT = {
     'af-south-1-los-1': 'africa',          # Lagos, Nigeria (Local Zone)
 }
 
+# Regex patterns for AWS region zone types
+LOCAL_ZONE_PATTERN = re.compile(r'^([a-z0-9-]+)-[a-z]{3,4}-\d+$')  # e.g., us-west-2-sea-1, ap-southeast-2-per-1
+WAVELENGTH_ZONE_PATTERN = re.compile(r'^([a-z0-9-]+)-wl\d+(?:-[a-z0-9]+)?$')  # e.g., us-east-1-wl1, eu-west-3-wl1-cmn1
+
+@lru_cache(maxsize=2048)
+def get_continent_from_region(region_code: str) -> Optional[str]:
+    """Map AWS region code to continent with support for Local Zones and Wavelength Zones.
+    
+    This function handles:
+    1. Direct mapping for standard regions
+    2. Local zones (e.g., us-west-2-sea-1 -> us-west-2)
+    3. Wavelength zones (e.g., us-east-1-wl1 -> us-east-1, eu-west-3-wl1-cmn1 -> eu-west-3)
+    
+    There are only a few hundred distinct region codes, so results are cached and
+    the zone patterns run once per code rather than once per price item.
+    
+    Args:
+        region_code: AWS region code
+        
+    Returns:
+        Continent name or None if unmapped
+    """
+    if not region_code:
+        return None
+        
+    # First try direct mapping for standard regions
+    continent = AWS_REGION_TO_CONTINENT.get(region_code)
+    if continent:
+        return continent
+    
+    # Try to extract base region from Local Zone pattern (e.g., us-west-2-sea-1)
+    local_zone_match = LOCAL_ZONE_PATTERN.match(region_code)
+    if local_zone_match:
+        base_region = local_zone_match.group(1)
+        return AWS_REGION_TO_CONTINENT.get(base_region)
+    
+    # Try to extract base region from Wavelength Zone pattern (e.g., us-east-1-wl1, eu-west-3-wl1-cmn1)
+    wavelength_zone_match = WAVELENGTH_ZONE_PATTERN.match(region_code)
+    if wavelength_zone_match:
+        base_region = wavelength_zone_match.group(1)
+        return AWS_REGION_TO_CONTINENT.get(base_region)
+    
+    # No mapping found
+    return None
+
+def hourly_usd_price(price_dimension: Dict[str, Any]) -> Optional[float]:
+    """Get the USD price of an hourly price dimension, or None if it has no valid USD price."""
+    price_per_unit = price_dimension.get("pricePerUnit", {})
+    if "USD" not in price_per_unit:
+        return None
+    
+    try:
+        return float(price_per_unit["USD"])
+    except (ValueError, TypeError):
+        return None
+
+# Patterns for the memory and GPU attributes of the pricing data
+MEMORY_PATTERN = re.compile(r'([\d.]+)\s*GiB')
+NUMBER_PATTERN = re.compile(r'([\d.]+)')
+GPU_PATTERN = re.compile(r'(\d+)\s*x?\s*(.+)')
+
+# The memory and GPU strings repeat across every price item of an instance type,
+# so their parsed values are cached
+
+@lru_cache(maxsize=4096)
+def extract_memory_gib(memory_string: str) -> float:
+    """Extract memory in GiB from AWS memory string."""
+    if not memory_string:
+        return 0.0
+    
+    # Fast path for the usual "16 GiB" / "1,952 GiB" format
+    number, separator, _ = memory_string.partition(' GiB')
+    number = number.replace(',', '')
+    if separator and number.replace('.', '', 1).isdecimal():
+        return float(number)
+    
+    match = MEMORY_PATTERN.search(memory_string)
+    if match:
+        return float(match.group(1))
+    return 0.0
+
+@lru_cache(maxsize=4096)
+def parse_gpu_attribute(gpu_info: str) -> Tuple[int, str]:
+    """Extract GPU count and name from the pricing API gpu attribute (e.g., "8 x NVIDIA V100")."""
+    gpu_match = GPU_PATTERN.search(gpu_info)
+    if gpu_match:
+        return int(gpu_match.group(1)), gpu_match.group(2).strip()
+    
+    # If gpu field is just a number (like "1"), treat it as count, not name
+    try:
+        return int(gpu_info), ""  # Name will be filled by EC2 API lookup
+    except ValueError:
+        # If it's not a number, treat as name
+        return 1, gpu_info
+
+@lru_cache(maxsize=4096)
+def parse_gpu_memory_gib(gpu_mem: str) -> float:
+    """Extract GPU memory in GiB from the pricing API gpuMemory attribute (e.g., "16 GiB" -> 16.0)."""
+    gpu_mem_match = MEMORY_PATTERN.search(gpu_mem)
+    if gpu_mem_match:
+        return float(gpu_mem_match.group(1))
+    
+    # Try to extract just numbers if no GiB pattern
+    number_match = NUMBER_PATTERN.search(gpu_mem)
+    if number_match:
+        return float(number_match.group(1))
+    return 0.0
+
+# Pricing attributes copied verbatim into their own CSV columns (vm_name, virtual_cpu_count,
+# cpu_arch), left out of other_details. Attributes that are mapped rather than copied, such as
+# regionCode (region holds only the continent) and operatingSystem, stay in other_details.
+PRICING_ATTRIBUTES_IN_COLUMNS = frozenset({'instanceType', 'vcpu', 'processorArchitecture'})
+
+# Operating system names that are classified as LINUX (matched case-insensitively)
+LINUX_OS_KEYWORDS = ('linux', 'rhel', 'sles', 'ubuntu', 'amazon')
+
+# Regions whose price lists are paged through concurrently; the Pricing API
+# paginates with a serial NextToken, so parallelism comes from splitting by region
+MAX_FETCH_WORKERS = 8
+
+# Minimum time between progress summary rewrites
+SUMMARY_INTERVAL_SECONDS = 30
+
 class AWSComputePricingExtractor:   
-    def __init__(self, max_records: Optional[int] = None):
+    def __init__(self, max_records: Optional[int] = None, fetch_workers: int = MAX_FETCH_WORKERS):
         """Initialize the AWS pricing client.
         
         Args:
             max_records: Maximum number of valid records to process. If None, process all records.
+            fetch_workers: Number of regions whose price lists are fetched concurrently.
         """
         self.pricing_client = boto3.client("pricing", region_name="us-east-1")
         self.ec2_client = boto3.client("ec2", region_name="us-east-1")
@@ -203,6 +334,7 @@ class AWSComputePricingExtractor:
         
         # Processing limits and batch configuration
         self.max_records = max_records
+        self.fetch_workers = fetch_workers
         self.batch_size = 200
         self.total_records = 0
         self.pages_processed = 0
@@ -212,24 +344,15 @@ class AWSComputePricingExtractor:
         self.error_count = 0  # Track errors without storing full data
         self.unmapped_regions = {}  # Track unmapped regions and their counts
         
-        # Compile regex patterns once for performance
-        self.memory_pattern = re.compile(r'([\d.]+)\s*GiB')
-        self.gpu_pattern = re.compile(r'(\d+)\s*x?\s*(.+)')
-        self.linux_os_pattern = re.compile(r'linux|rhel|sles|ubuntu|amazon', re.IGNORECASE)
-        self.windows_os_pattern = re.compile(r'windows', re.IGNORECASE)
-        
-        # Regex patterns for AWS region zone types
-        self.local_zone_pattern = re.compile(r'^([a-z0-9-]+)-[a-z]{3,4}-\d+$')  # e.g., us-west-2-sea-1, ap-southeast-2-per-1
-        self.wavelength_zone_pattern = re.compile(r'^([a-z0-9-]+)-wl\d+(?:-[a-z0-9]+)?$')  # e.g., us-east-1-wl1, eu-west-3-wl1-cmn1
-        
-        # Cache for instance type details to avoid repeated API calls
+        # Instance type details from the EC2 API, filled by prefetch_instance_types()
         self.instance_type_cache = {}
         
-        # Initialize new timestamped CSV file with headers
+        # Initialize new timestamped CSV file with headers; it stays open for the whole
+        # run so batches are appended through one buffered writer
         logger.info(f"Creating new timestamped CSV file: {self.csv_file_path}")
-        with open(self.csv_file_path, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=self.csv_columns, quoting=csv.QUOTE_ALL)
-            writer.writeheader()
+        self._csvfile = open(self.csv_file_path, 'w', newline='', encoding='utf-8', buffering=1 << 20)
+        self._writer = csv.writer(self._csvfile, quoting=csv.QUOTE_ALL)
+        self._writer.writerow(self.csv_columns)
         
         # Log processing limits
         if self.max_records:
@@ -239,92 +362,41 @@ class AWSComputePricingExtractor:
         
         logger.info("Using dynamic GPU information extraction via EC2 API")
         
-    def get_continent_from_region(self, region_code: str) -> Optional[str]:
-        """Map AWS region code to continent with support for Local Zones and Wavelength Zones.
-        
-        This function handles:
-        1. Direct mapping for standard regions
-        2. Local zones (e.g., us-west-2-sea-1 -> us-west-2)
-        3. Wavelength zones (e.g., us-east-1-wl1 -> us-east-1, eu-west-3-wl1-cmn1 -> eu-west-3)
-        
-        Args:
-            region_code: AWS region code
-            
-        Returns:
-            Continent name or None if unmapped
-        """
-        if not region_code:
-            return None
-            
-        # First try direct mapping for standard regions
-        continent = AWS_REGION_TO_CONTINENT.get(region_code)
-        if continent:
-            return continent
-        
-        # Try to extract base region from Local Zone pattern (e.g., us-west-2-sea-1)
-        local_zone_match = self.local_zone_pattern.match(region_code)
-        if local_zone_match:
-            base_region = local_zone_match.group(1)
-            return AWS_REGION_TO_CONTINENT.get(base_region)
-        
-        # Try to extract base region from Wavelength Zone pattern (e.g., us-east-1-wl1, eu-west-3-wl1-cmn1)
-        wavelength_zone_match = self.wavelength_zone_pattern.match(region_code)
-        if wavelength_zone_match:
-            base_region = wavelength_zone_match.group(1)
-            return AWS_REGION_TO_CONTINENT.get(base_region)
-        
-        # No mapping found
-        return None
-        
     def map_os_type(self, os_string: str) -> str:
         """Map AWS OS string to standardized OS type."""
         if not os_string:
             return "OTHER"
         
-        if self.windows_os_pattern.search(os_string):
+        os_lower = os_string.lower()
+        if "windows" in os_lower:
             return "WINDOWS"
-        elif self.linux_os_pattern.search(os_string):
+        elif any(keyword in os_lower for keyword in LINUX_OS_KEYWORDS):
             return "LINUX"
         else:
             return "OTHER"
     
-    def extract_memory_gib(self, memory_string: str) -> float:
-        """Extract memory in GiB from AWS memory string."""
-        if not memory_string:
-            return 0.0
-        
-        match = self.memory_pattern.search(memory_string)
-        if match:
-            return float(match.group(1))
-        return 0.0
-    
-    def get_instance_type_details(self, instance_type: str) -> Dict[str, Any]:
-        """Get instance type details from EC2 API with caching."""
-        if instance_type in self.instance_type_cache:
-            return self.instance_type_cache[instance_type]
+    def prefetch_instance_types(self):
+        """Load details for every EC2 instance type into the cache in bulk.
         
+        DescribeInstanceTypes returns up to 100 types per page, so the whole catalogue
+        takes a handful of calls instead of one round trip per instance type.
+        """
         try:
-            response = self.ec2_client.describe_instance_types(
-                InstanceTypes=[instance_type]
-            )
-            
-            if response['InstanceTypes']:
-                details = response['InstanceTypes'][0]
-                
-                # Debug log the full response structure for GPU instances
-                if 'GpuInfo' in details and len(self.instance_type_cache) <= 3:
-                    logger.debug(f"Full EC2 response for {instance_type}: {json.dumps(details, indent=2, default=str)}")
-                
-                self.instance_type_cache[instance_type] = details
-                return details
-            else:
-                self.instance_type_cache[instance_type] = {}
-                return {}
-                
+            paginator = self.ec2_client.get_paginator("describe_instance_types")
+            for page in paginator.paginate(PaginationConfig={'PageSize': 100}):
+                for details in page['InstanceTypes']:
+                    # The instance type is the cache key and the vm_name column; keep the rest
+                    instance_type = details.pop('InstanceType')
+                    self.instance_type_cache[instance_type] = details
         except Exception as e:
-            logger.debug(f"Failed to get instance type details for {instance_type}: {e}")
-            self.instance_type_cache[instance_type] = {}
-            return {}
+            # Without EC2 details the records still get pricing data, as before
+            logger.warning(f"Failed to prefetch EC2 instance type details: {e}")
+        
+        logger.info(f"Loaded details for {len(self.instance_type_cache)} EC2 instance types")
+    
+    def get_instance_type_details(self, instance_type: str) -> Dict[str, Any]:
+        """Get instance type details from the prefetched EC2 API cache."""
+        return self.instance_type_cache.get(instance_type, {})
     
     def extract_gpu_info(self, attributes: Dict[str, Any]) -> tuple:
         """Extract GPU count, name, and memory from attributes using dynamic EC2 API."""
@@ -332,37 +404,18 @@ class AWSComputePricingExtractor:
         gpu_name = ""
         gpu_memory = 0.0
         
-        instance_type = attributes.get("instanceType", "")
+        get_attribute = attributes.get
+        instance_type = get_attribute("instanceType", "")
         
         # First, check for GPU-related attributes in pricing data
-        gpu_info = attributes.get("gpu", "")
+        gpu_info = get_attribute("gpu", "")
         if gpu_info and gpu_info not in ("NA", ""):
-            gpu_match = self.gpu_pattern.search(gpu_info)
-            if gpu_match:
-                gpu_count = int(gpu_match.group(1))
-                gpu_name = gpu_match.group(2).strip()
-            else:
-                # If gpu field is just a number (like "1"), treat it as count, not name
-                try:
-                    gpu_count = int(gpu_info)
-                    gpu_name = ""  # Will be filled by EC2 API lookup
-                except ValueError:
-                    # If it's not a number, treat as name
-                    gpu_count = 1
-                    gpu_name = gpu_info
+            gpu_count, gpu_name = parse_gpu_attribute(gpu_info)
         
         # Check GPU memory from pricing data
-        gpu_mem = attributes.get("gpuMemory", "")
+        gpu_mem = get_attribute("gpuMemory", "")
         if gpu_mem and gpu_mem not in ("NA", ""):
-            # Extract numeric value from GPU memory string (e.g., "16 GiB" -> 16.0)
-            gpu_mem_match = self.memory_pattern.search(gpu_mem)
-            if gpu_mem_match:
-                gpu_memory = float(gpu_mem_match.group(1))
-            else:
-                # Try to extract just numbers if no GiB pattern
-                number_match = re.search(r'([\d.]+)', gpu_mem)
-                if number_match:
-                    gpu_memory = float(number_match.group(1))
+            gpu_memory = parse_gpu_memory_gib(gpu_mem)
         
         # Get EC2 API details for meta information and GPU fallback
         instance_details = {}
@@ -405,13 +458,44 @@ class AWSComputePricingExtractor:
             
         return gpu_count, gpu_name, gpu_memory, instance_details
     
-    def process_price_item(self, price_item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Process a single price item and extract relevant data."""
+    def extract_hourly_price(self, on_demand_terms: Dict[str, Any]) -> float:
+        """Get the hourly USD price from OnDemand terms.
+        
+        Returns:
+            The price from the first term with a non-zero hourly rate, or 0.0 if an
+            hourly price dimension has no valid USD price
+        """
+        # Fast path: Compute Instance items have a single OnDemand term whose first
+        # price dimension is the hourly rate
+        if len(on_demand_terms) == 1:
+            term = next(iter(on_demand_terms.values()))
+            price_dimension = next(iter(term.get("priceDimensions", {}).values()), None)
+            if price_dimension is not None and price_dimension.get("unit") == "Hrs":
+                price_per_hour = hourly_usd_price(price_dimension)
+                return 0.0 if price_per_hour is None else price_per_hour
+        
+        price_per_hour = 0.0
+        for term in on_demand_terms.values():
+            price_dimensions = term.get("priceDimensions", {})
+            for price_dimension in price_dimensions.values():
+                if price_dimension.get("unit") == "Hrs":
+                    price_per_hour = hourly_usd_price(price_dimension)
+                    if price_per_hour is None:
+                        return 0.0
+                    break
+            if price_per_hour > 0:
+                break
+        return price_per_hour
+    
+    def process_price_item(self, price_item: Dict[str, Any]) -> Optional[tuple]:
+        """Process a single price item and extract relevant data as a row in csv_columns order."""
         try:
             self.items_seen += 1
             
             product = price_item.get("product", {})
             attributes = product.get("attributes", {})
+            # Bound once; the attributes are read many times per item
+            get_attribute = attributes.get
             
             # Check for OnDemand pricing terms
             terms = price_item.get("terms", {})
@@ -421,16 +505,9 @@ class AWSComputePricingExtractor:
                 self.items_filtered_out += 1
                 return None
             
-            # Extract basic compute specs with optimized attribute access
-            vm_name = attributes.get("instanceType", "")
-            provider_name = "AWS"
-            vcpu = int(attributes.get("vcpu", 0))
-            memory_gib = self.extract_memory_gib(attributes.get("memory", ""))
-            cpu_arch = attributes.get("processorArchitecture", "")
-            
-            # Map region to continent - filter out unmapped regions
-            region_code = attributes.get("regionCode", "")
-            continent = self.get_continent_from_region(region_code)
+            # Map region to continent - filter out unmapped regions before parsing anything else
+            region_code = get_attribute("regionCode", "")
+            continent = get_continent_from_region(region_code)
             
             # If region is not mapped, track it and filter out the record
             if continent is None:
@@ -442,32 +519,21 @@ class AWSComputePricingExtractor:
                     self.unmapped_regions[region_code] = 1
                 return None
             
+            # Extract basic compute specs with optimized attribute access
+            vm_name = get_attribute("instanceType", "")
+            provider_name = "AWS"
+            vcpu = int(get_attribute("vcpu", 0))
+            memory_gib = extract_memory_gib(get_attribute("memory", ""))
+            cpu_arch = get_attribute("processorArchitecture", "")
+            
             # Map OS type
-            os_type = self.map_os_type(attributes.get("operatingSystem", ""))
+            os_type = self.map_os_type(get_attribute("operatingSystem", ""))
             
             # Extract GPU information and get EC2 instance details
             gpu_count, gpu_name, gpu_memory, ec2_instance_details = self.extract_gpu_info(attributes)
             
             # Get pricing information from OnDemand terms
-            price_per_hour = 0.0
-            
-            for term in on_demand_terms.values():
-                price_dimensions = term.get("priceDimensions", {})
-                for price_dimension in price_dimensions.values():
-                    if price_dimension.get("unit") == "Hrs":
-                        price_per_unit = price_dimension.get("pricePerUnit", {})
-                        if "USD" not in price_per_unit:
-                            self.items_filtered_out += 1
-                            return None
-                        
-                        try:
-                            price_per_hour = float(price_per_unit["USD"])
-                        except (ValueError, TypeError):
-                            self.items_filtered_out += 1
-                            return None
-                        break
-                if price_per_hour > 0:
-                    break
+            price_per_hour = self.extract_hourly_price(on_demand_terms)
             
             # Filter out items with zero or no valid USD pricing
             if price_per_hour <= 0.0:
@@ -475,33 +541,35 @@ class AWSComputePricingExtractor:
                 return None            
             # Create comprehensive meta information combining pricing and EC2 API data
             meta_info = {
-                'pricing_api': attributes,  # All pricing API attributes
-                'ec2_api': ec2_instance_details  # All EC2 API instance details
+                # Pricing API attributes not already stored in their own columns
+                'pricing_api': {key: value for key, value in attributes.items()
+                                if key not in PRICING_ATTRIBUTES_IN_COLUMNS},
+                'ec2_api': ec2_instance_details  # All EC2 API instance details except the type
             }
             # Stringify JSON - let CSV writer handle the escaping automatically
-            meta_json_string = json.dumps(meta_info, separators=(',', ':'), default=str, ensure_ascii=True)
+            meta_json_string = orjson.dumps(meta_info, default=str).decode('utf-8')
             
-            return {
-                'vm_name': vm_name,
-                'provider_name': provider_name,
-                'virtual_cpu_count': vcpu,
-                'memory_gb': memory_gib,
-                'cpu_arch': cpu_arch,
-                'price_per_hour_usd': price_per_hour,
-                'gpu_count': gpu_count,
-                'gpu_name': gpu_name,
-                'gpu_memory': gpu_memory,
-                'os_type': os_type,
-                'region': continent,
-                'other_details': meta_json_string
-            }
+            return (
+                vm_name,
+                provider_name,
+                vcpu,
+                memory_gib,
+                cpu_arch,
+                price_per_hour,
+                gpu_count,
+                gpu_name,
+                gpu_memory,
+                os_type,
+                continent,
+                meta_json_string
+            )
             
         except Exception as e:
             self.items_with_errors += 1
             self.error_count += 1
             return None
     
-    def append_batch_to_csv(self, data_batch: List[Dict[str, Any]]) -> bool:
+    def append_batch_to_csv(self, data_batch: List[tuple]) -> bool:
         """Append a batch of data to the timestamped CSV file.
         
         Returns:
@@ -520,9 +588,7 @@ class AWSComputePricingExtractor:
                 records_to_write = data_batch[:remaining_slots]
                 logger.info(f"Truncating batch to {len(records_to_write)} records to stay within limit of {self.max_records}")
             
-        with open(self.csv_file_path, 'a', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=self.csv_columns, quoting=csv.QUOTE_ALL)
-            writer.writerows(records_to_write)
+        self._writer.writerows(records_to_write)
         
         self.total_records += len(records_to_write)
         
@@ -533,8 +599,15 @@ class AWSComputePricingExtractor:
         
         return True
     
+    def close(self):
+        """Flush and close the CSV file."""
+        if not self._csvfile.closed:
+            self._csvfile.close()
+    
     def write_progress_summary(self):
         """Write a progress summary to a single file that gets updated."""
+        # Flush first so the CSV on disk holds every record the summary counts
+        self._csvfile.flush()
         with open(self.summary_file_path, 'w') as f:
             f.write(f"AWS Pricing Data Extraction Summary\n")
             f.write(f"=" * 40 + "\n")
@@ -558,6 +631,44 @@ class AWSComputePricingExtractor:
                 for region, count in sorted_regions:
                     f.write(f"  {region}: {count} instances\n")
     
+    def get_region_codes(self, service_code: str) -> List[str]:
+        """List every region code the Pricing API has prices for."""
+        paginator = self.pricing_client.get_paginator("get_attribute_values")
+        region_codes = []
+        for page in paginator.paginate(ServiceCode=service_code, AttributeName="regionCode"):
+            region_codes.extend(value["Value"] for value in page["AttributeValues"])
+        return region_codes
+    
+    def _fetch_region_pages(self, service_code: str, filters: List[Dict[str, str]], region_code: str,
+                            pages: queue.Queue, stop: threading.Event):
+        """Page through the price list of one region, putting each page on the queue.
+        
+        A None is put once the region is done, or the exception if fetching failed.
+        """
+        def put(item) -> bool:
+            # Give up once the consumer has stopped, instead of blocking on a full queue
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        try:
+            paginator = self.pricing_client.get_paginator("get_products")
+            page_iterator = paginator.paginate(
+                ServiceCode=service_code,
+                Filters=filters + [{"Type": "TERM_MATCH", "Field": "regionCode", "Value": region_code}]
+            )
+            for page in page_iterator:
+                if stop.is_set() or not put(page["PriceList"]):
+                    return
+        except Exception as e:
+            put(e)
+            return
+        put(None)
+    
     def fetch_all_compute_pricing(self):
         """Fetch all AWS compute pricing data and save to a timestamped CSV file."""
         logger.info("Starting AWS compute pricing data extraction...")
@@ -572,59 +683,76 @@ class AWSComputePricingExtractor:
         logger.info(f"Batch processing size: {self.batch_size} records")
         
         try:
-            paginator = self.pricing_client.get_paginator("get_products")
-            page_iterator = paginator.paginate(
-                ServiceCode=service_code,
-                Filters=filters
-            )
+            self.prefetch_instance_types()
+            
+            region_codes = self.get_region_codes(service_code)
+            logger.info(f"Fetching {len(region_codes)} regions, {self.fetch_workers} at a time")
             
             current_batch = []
             should_continue = True
+            page_num = 0
+            last_summary_time = time.monotonic()
             
-            for page_num, page in enumerate(page_iterator, 1):
-                if not should_continue:
-                    break
-                    
-                self.pages_processed = page_num
+            # Regions are fetched by worker threads; pages are processed here, in arrival order
+            pages = queue.Queue(maxsize=2 * self.fetch_workers)
+            stop = threading.Event()
+            with ThreadPoolExecutor(max_workers=self.fetch_workers) as executor:
+                for region_code in region_codes:
+                    executor.submit(self._fetch_region_pages, service_code, filters, region_code, pages, stop)
                 
-                page_valid_items = 0
-                
-                # Process all items in the page
-                for price_item_json in page["PriceList"]:
-                    if not should_continue:
-                        break
+                try:
+                    regions_remaining = len(region_codes)
+                    while should_continue and regions_remaining:
+                        price_list = pages.get()
+                        if price_list is None:
+                            regions_remaining -= 1
+                            continue
+                        if isinstance(price_list, Exception):
+                            raise price_list
                         
-                    # Parse JSON once and reuse
-                    try:
-                        price_item = json.loads(price_item_json)
-                        processed_item = self.process_price_item(price_item)
+                        page_num += 1
+                        self.pages_processed = page_num
                         
-                        if processed_item:
-                            current_batch.append(processed_item)
-                            page_valid_items += 1
-                            
-                            # Write batch when it reaches the desired size
-                            if len(current_batch) >= self.batch_size:
-                                should_continue = self.append_batch_to_csv(current_batch)
-                                current_batch = []
-                                if not should_continue:
-                                    break
-                    except json.JSONDecodeError:
-                        self.items_with_errors += 1
-                        continue
-                
-                # Log progress every 25 pages
-                if page_num % 25 == 0:
-                    logger.info(f"Page {page_num}: {page_valid_items} valid items, {self.total_records} total records")
-                
-                # Write batch after every 20 pages if not empty
-                if page_num % 20 == 0 and current_batch and should_continue:
-                    should_continue = self.append_batch_to_csv(current_batch)
-                    current_batch = []
-                
-                # Write progress summary every 100 pages
-                if page_num % 100 == 0:
-                    self.write_progress_summary()
+                        page_valid_items = 0
+                        
+                        # Process all items in the page
+                        for price_item_json in price_list:
+                            # Parse JSON once and reuse
+                            try:
+                                price_item = orjson.loads(price_item_json)
+                                processed_item = self.process_price_item(price_item)
+                                
+                                if processed_item:
+                                    current_batch.append(processed_item)
+                                    page_valid_items += 1
+                                    
+                                    # Write batch when it reaches the desired size
+                                    if len(current_batch) >= self.batch_size:
+                                        should_continue = self.append_batch_to_csv(current_batch)
+                                        current_batch = []
+                                        if not should_continue:
+                                            break
+                            except orjson.JSONDecodeError:
+                                self.items_with_errors += 1
+                                continue
+                        
+                        # Log progress every 25 pages
+                        if page_num % 25 == 0:
+                            logger.info(f"Page {page_num}: {page_valid_items} valid items, {self.total_records} total records")
+                        
+                        # Write batch after every 20 pages if not empty
+                        if page_num % 20 == 0 and current_batch and should_continue:
+                            should_continue = self.append_batch_to_csv(current_batch)
+                            current_batch = []
+                        
+                        # Write progress summary at most every SUMMARY_INTERVAL_SECONDS
+                        if time.monotonic() - last_summary_time >= SUMMARY_INTERVAL_SECONDS:
+                            self.write_progress_summary()
+                            last_summary_time = time.monotonic()
+                finally:
+                    # Stop the remaining fetches when done early, at the record limit or on an error
+                    stop.set()
+                    executor.shutdown(cancel_futures=True)
             
             # Write remaining data if any
             if current_batch and should_continue:
@@ -640,6 +768,8 @@ class AWSComputePricingExtractor:
         except Exception as e:
             logger.error(f"Error during data extraction: {e}")
             raise
+        finally:
+            self.close()
 
 def main():
     """Main function to run the pricing data extraction."""
@@ -648,12 +778,14 @@ def main():
     parser = argparse.ArgumentParser(description='Extract AWS EC2 on-demand pricing data')
     parser.add_argument('--max-records', type=int, default=None, 
                        help='Maximum number of records to process (default: no limit)')
+    parser.add_argument('--fetch-workers', type=int, default=MAX_FETCH_WORKERS,
+                       help=f'Number of regions fetched concurrently (default: {MAX_FETCH_WORKERS})')
     
     args = parser.parse_args()
     
     try:
         logger.info("Initializing AWS Compute Pricing Extractor...")
-        extractor = AWSComputePricingExtractor(max_records=args.max_records)
+        extractor = AWSComputePricingExtractor(max_records=args.max_records, fetch_workers=args.fetch_workers)
         
         logger.info("Starting optimized data extraction process...")
         extractor.fetch_all_compute_pricing()
@@ -168,6 +168,18 @@ AWS_LOCATION_TO_REGION_CODE = {
     'China (Ningxia)': 'cn-northwest-1',
 }
 
+def format_price(value: Any) -> Any:
+    """Format a price field for the CSV: a float, or an empty string when missing."""
+    if value is None or value == "":
+        # Set empty values to empty string for proper CSV formatting
+        return ""
+    try:
+        # Ensure the value is a float, not a string
+        return float(value)
+    except (ValueError, TypeError):
+        # Keep original value if conversion fails
+        return value
+
 class AWSStoragePricingExtractor:
     def __init__(self, max_records: Optional[int] = None):
         self.pricing_client = boto3.client("pricing", region_name="us-east-1")
@@ -232,10 +244,11 @@ class AWSStoragePricingExtractor:
         self.local_zone_pattern = re.compile(r'^([a-z0-9-]+)-[a-z]{3,4}-\d+$')
         self.wavelength_zone_pattern = re.compile(r'^([a-z0-9-]+)-wl\d+(?:-[a-z0-9]+)?$')
         
+        # The CSV stays open for the whole run so batches go through one buffered writer
         logger.info(f"Creating new CSV file: {self.csv_file_path}")
-        with open(self.csv_file_path, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=self.csv_columns, quoting=csv.QUOTE_NONNUMERIC)
-            writer.writeheader()
+        self._csvfile = open(self.csv_file_path, 'w', newline='', encoding='utf-8', buffering=1 << 20)
+        self._writer = csv.writer(self._csvfile, quoting=csv.QUOTE_NONNUMERIC)
+        self._writer.writerow(self.csv_columns)
             
         if self.max_records:
             logger.info(f"Processing limit: {self.max_records} records")
@@ -406,7 +419,7 @@ class AWSStoragePricingExtractor:
                         price = self.extract_price(term.get("priceDimensions", {}))
                         if price is not None and price > 0:
                             capacity_price = price
-                            logger.debug(f"Found capacity price for {region_code}-{storage_class}: ${price:.6f}/GB-Mo")
+                            logger.debug("Found capacity price for %s-%s: $%.6f/GB-Mo", region_code, storage_class, price)
                             break
                 
                 if capacity_price is not None:
@@ -416,10 +429,10 @@ class AWSStoragePricingExtractor:
             if capacity_price is None:
                 if has_gb_mo_unit:
                     self.family_stats['Storage']['no_capacity_price'] += 1
-                    logger.debug(f"Skipping {region_code}-{storage_class}: Has GB-Mo unit but no valid USD price")
+                    logger.debug("Skipping %s-%s: Has GB-Mo unit but no valid USD price", region_code, storage_class)
                 else:
                     self.family_stats['Storage']['missing_gb_mo_unit'] += 1
-                    logger.debug(f"Skipping {region_code}-{storage_class}: No GB-Mo unit found")
+                    logger.debug("Skipping %s-%s: No GB-Mo unit found", region_code, storage_class)
                 
                 # Count total skipped due to no USD pricing
                 self.family_stats['Storage']['skipped_no_usd_pricing'] += 1
@@ -446,12 +459,12 @@ class AWSStoragePricingExtractor:
                     'other_details': json.dumps({"pricing_api": attributes}, separators=(',', ':'), default=str, ensure_ascii=True)
                 }
                 self.family_stats['Storage']['created_records'] += 1
-                logger.debug(f"Created record for {region_code}-{storage_class} with capacity price ${capacity_price:.6f}")
+                logger.debug("Created record for %s-%s with capacity price $%.6f", region_code, storage_class, capacity_price)
             else:
                 # Record exists, update capacity price if current is None
                 if self.storage_records_map[record_key]['capacity_price'] is None:
                     self.storage_records_map[record_key]['capacity_price'] = capacity_price
-                    logger.debug(f"Updated capacity price for {region_code}-{storage_class}: ${capacity_price:.6f}/GB-Mo")
+                    logger.debug("Updated capacity price for %s-%s: $%.6f/GB-Mo", region_code, storage_class, capacity_price)
 
         except Exception as e:
             self.items_with_errors += 1
@@ -499,7 +512,7 @@ class AWSStoragePricingExtractor:
                              ("requests" in unit or "requests" in unit_desc):
                             # Glacier/Archive operations can be expensive per request, but cap the conversion
                             if base_price > 0.05:  # If more than 5 cents per request, it's likely not per-request pricing
-                                logger.debug(f"Skipping high-priced archive operation: ${base_price} - {unit_desc} - SKU: {price_item.get('product', {}).get('sku')}")
+                                logger.debug("Skipping high-priced archive operation: $%s - %s - SKU: %s", base_price, unit_desc, price_item.get('product', {}).get('sku'))
                                 continue
                             price_per_million = base_price * 1000000
                             conversion_info = f"archive_per_request: {base_price} * 1000000 = {price_per_million}"
@@ -521,18 +534,18 @@ class AWSStoragePricingExtractor:
                             else:
                                 # Default to per-request but validate price
                                 if base_price > 0.01:
-                                    logger.debug(f"Skipping suspicious request price from description: ${base_price} - {unit_desc} - SKU: {price_item.get('product', {}).get('sku')}")
+                                    logger.debug("Skipping suspicious request price from description: $%s - %s - SKU: %s", base_price, unit_desc, price_item.get('product', {}).get('sku'))
                                     continue
                                 price_per_million = base_price * 1000000
                                 conversion_info = f"desc_per_request: {base_price} * 1000000 = {price_per_million}"
                         else:
                             # Skip non-request pricing items or unrecognized patterns
-                            logger.debug(f"Skipping non-request item: unit='{unit}', desc='{unit_desc}', price=${base_price} - SKU: {price_item.get('product', {}).get('sku')}")
+                            logger.debug("Skipping non-request item: unit='%s', desc='%s', price=$%s - SKU: %s", unit, unit_desc, base_price, price_item.get('product', {}).get('sku'))
                             continue
                         
                         # Validate the result is reasonable for S3 operations
                         if price_per_million < 0.00001:
-                            logger.debug(f"Skipping very low price: ${price_per_million:.6f} from {conversion_info}")
+                            logger.debug("Skipping very low price: $%.6f from %s", price_per_million, conversion_info)
                             continue
                         elif price_per_million > 5000:  # Adjust threshold to $5000 per million for S3
                             logger.warning(f"High price per million: ${price_per_million:.6f} from {conversion_info} - SKU: {price_item.get('product', {}).get('sku')}")
@@ -542,7 +555,7 @@ class AWSStoragePricingExtractor:
                         price_per_million = round(price_per_million, 6)
                         break
                     except (ValueError, TypeError) as e:
-                        logger.debug(f"Failed to parse price: {price_str} - {e}")
+                        logger.debug("Failed to parse price: %s - %s", price_str, e)
                         continue
             if price_per_million > 0:
                 break
@@ -602,12 +615,12 @@ class AWSStoragePricingExtractor:
         
         if not price_key:
             self.family_stats['API Request']['unknown_operations'] += 1
-            logger.debug(f"Could not determine operation type for SKU {price_item.get('product', {}).get('sku')} - operation: {operation}, usage_type: {usage_type}")
+            logger.debug("Could not determine operation type for SKU %s - operation: %s, usage_type: %s", price_item.get('product', {}).get('sku'), operation, usage_type)
             return
 
         # Log the price assignment for debugging
         sku = price_item.get('product', {}).get('sku')
-        logger.debug(f"Setting {price_key} = ${price_per_million:.6f} for {continent} - {conversion_info} - SKU: {sku}")
+        logger.debug("Setting %s = $%.6f for %s - %s - SKU: %s", price_key, price_per_million, continent, conversion_info, sku)
 
         # Determine which storage classes this applies to based on usage type
         target_storage_classes = []
@@ -643,7 +656,7 @@ class AWSStoragePricingExtractor:
                 if current_price is None or abs(current_price - price_per_million) > 0.000001:  # Only update if different
                     self.storage_records_map[key][price_key] = price_per_million
                     matches_found += 1
-                    logger.debug(f"Updated {price_key} for {region_code}-{storage_class}: ${price_per_million:.6f}")
+                    logger.debug("Updated %s for %s-%s: $%.6f", price_key, region_code, storage_class, price_per_million)
         
         # Track enrichment if any matches were found
         if matches_found > 0:
@@ -657,7 +670,7 @@ class AWSStoragePricingExtractor:
                 if current_price is None:
                     self.storage_records_map[fallback_key][price_key] = price_per_million
                     self.family_stats['API Request']['enrichments_applied'] += 1
-                    logger.debug(f"Applied {price_key} to fallback {region_code}-General Purpose: ${price_per_million:.6f}")
+                    logger.debug("Applied %s to fallback %s-General Purpose: $%.6f", price_key, region_code, price_per_million)
 
     def process_data_transfer_item(self, price_item: Dict[str, Any]):
         self.family_stats['Data Transfer']['seen'] += 1
@@ -739,7 +752,7 @@ class AWSStoragePricingExtractor:
                 if current_price is None:
                     self.storage_records_map[key]['flat_item_price'] = fee_price
                     enriched_count += 1
-                    logger.debug(f"Applied fee ${fee_price:.6f} to {region_code}-{storage_class}")
+                    logger.debug("Applied fee $%.6f to %s-%s", fee_price, region_code, storage_class)
         
         self.family_stats['Fee']['enrichments_applied'] += enriched_count
 
@@ -754,36 +767,29 @@ class AWSStoragePricingExtractor:
             if len(data_batch) > remaining_slots:
                 records_to_write = data_batch[:remaining_slots]
         
-        # Format numeric fields to avoid scientific notation and convert region codes to continent names
-        formatted_records = []
+        # Build rows in csv_columns order, converting region codes to continent names
+        # and formatting the price fields
+        rows = []
         for record in records_to_write:
-            formatted_record = record.copy()
-            
             # Convert region code back to continent name for display
-            region_code = formatted_record.get('region')
-            if region_code:
-                continent = self.get_continent_from_region(region_code)
-                if continent:
-                    formatted_record['region'] = continent
+            region = record.get('region', '')
+            if region:
+                region = self.get_continent_from_region(region) or region
             
-            # Ensure price fields are numeric (float) values, not strings
-            for price_field in ['capacity_price', 'read_price', 'write_price', 'flat_item_price']:
-                value = formatted_record.get(price_field)
-                if value is not None and value != "":
-                    try:
-                        # Ensure the value is a float, not a string
-                        formatted_record[price_field] = float(value)
-                    except (ValueError, TypeError):
-                        # Keep original value if conversion fails
-                        pass
-                else:
-                    # Set empty values to empty string for proper CSV formatting
-                    formatted_record[price_field] = ""
-            formatted_records.append(formatted_record)
+            rows.append((
+                record.get('provider_name', ''),
+                record.get('service_name', ''),
+                record.get('storage_class', ''),
+                region,
+                record.get('access_tier', ''),
+                format_price(record.get('capacity_price')),
+                format_price(record.get('read_price')),
+                format_price(record.get('write_price')),
+                format_price(record.get('flat_item_price')),
+                record.get('other_details', '')
+            ))
             
-        with open(self.csv_file_path, 'a', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=self.csv_columns, quoting=csv.QUOTE_NONNUMERIC)
-            writer.writerows(formatted_records)
+        self._writer.writerows(rows)
         
         self.total_records += len(records_to_write)
         
@@ -793,6 +799,11 @@ class AWSStoragePricingExtractor:
             
         return True
 
+    def close(self):
+        """Flush and close the CSV file."""
+        if not self._csvfile.closed:
+            self._csvfile.close()
+
     def write_progress_summary(self):
         summary_content = f"""AWS S3 Storage Pricing Extraction Summary
 =============================================
@@ -880,84 +891,87 @@ No valid pricing: {self.no_valid_pricing}
         except IOError as e:
             logger.error(f"Error writing summary file: {e}")
 
+    def iter_price_items(self, paginator, family: str):
+        """Yield the parsed price items of one product family as their pages arrive."""
+        try:
+            pages = paginator.paginate(
+                ServiceCode='AmazonS3',
+                Filters=[{'Type': 'TERM_MATCH', 'Field': 'productFamily', 'Value': family}]
+            )
+
+            for page in pages:
+                self.pages_processed += 1
+                for item_str in page.get('PriceList', []):
+                    self.items_seen += 1
+                    try:
+                        price_item = json.loads(item_str)
+                    except json.JSONDecodeError:
+                        logger.warning("Failed to decode JSON price item.")
+                        self.items_with_errors += 1
+                        continue
+                    yield price_item
+        except Exception as e:
+            logger.error(f"Failed to fetch pricing for {family}: {e}")
+
     def fetch_all_storage_pricing(self):
         logger.info("Starting AWS S3 storage pricing data extraction...")
         
-        paginator = self.pricing_client.get_paginator('get_products')
-        
-        all_price_items = []
-        product_families = ["Storage", "API Request", "Data Transfer", "Fee"]
-
-        for family in product_families:
-            logger.info(f"Fetching data for product family: {family}...")
-            try:
-                pages = paginator.paginate(
-                    ServiceCode='AmazonS3',
-                    Filters=[{'Type': 'TERM_MATCH', 'Field': 'productFamily', 'Value': family}]
-                )
-
-                for page in pages:
-                    self.pages_processed += 1
-                    price_list = page.get('PriceList', [])
-                    
-                    if self.max_records and len(all_price_items) >= self.max_records:
+        try:
+            paginator = self.pricing_client.get_paginator('get_products')
+        
+            product_families = ["Storage", "API Request", "Data Transfer", "Fee"]
+
+            # Items are processed as their pages arrive rather than collected first. Storage
+            # is fetched before the other families, so its base records exist by the time
+            # API Request and Fee items enrich them.
+            items_processed = 0
+
+            # Create a set to track which records have been modified to avoid duplicate processing
+            processed_records = set()
+
+            for family in product_families:
+                logger.info(f"Fetching data for product family: {family}...")
+                for item in self.iter_price_items(paginator, family):
+                    item_family = item.get('product', {}).get('productFamily')
+                    sku = item.get('product', {}).get('sku')
+
+                    if item_family == 'Storage':
+                        # Storage items create base records
+                        self.process_storage_item(item)
+                    elif sku not in processed_records:
+                        # Enrich with API, data transfer, and fee data
+                        if item_family == 'API Request':
+                            self.process_api_request_item(item)
+                            processed_records.add(sku)
+                        elif item_family == 'Data Transfer':
+                            self.process_data_transfer_item(item)
+                            processed_records.add(sku)
+                        elif item_family == 'Fee':
+                            self.process_fee_item(item)
+                            processed_records.add(sku)
+
+                    items_processed += 1
+                    if self.max_records and items_processed >= self.max_records:
                         break
-
-                    for item_str in price_list:
-                        self.items_seen += 1
-                        try:
-                            price_item = json.loads(item_str)
-                            all_price_items.append(price_item)
-                        except json.JSONDecodeError:
-                            logger.warning("Failed to decode JSON price item.")
-                            self.items_with_errors += 1
-                        
-                        if self.max_records and len(all_price_items) >= self.max_records:
-                            break
-            except Exception as e:
-                logger.error(f"Failed to fetch pricing for {family}: {e}")
             
-            if self.max_records and len(all_price_items) >= self.max_records:
-                logger.info(f"Reached max record limit of {self.max_records}. "
-                            f"Processing {len(all_price_items)} records.")
-                break
-
-        logger.info(f"Collected {len(all_price_items)} price items in total. Processing...")
-
-        # Create a set to track which records have been modified to avoid duplicate processing
-        processed_records = set()
+                if self.max_records and items_processed >= self.max_records:
+                    logger.info(f"Reached max record limit of {self.max_records}. "
+                                f"Processed {items_processed} records.")
+                    break
 
-        # First pass: process storage items to create base records
-        for item in all_price_items:
-            if item.get('product', {}).get('productFamily') == 'Storage':
-                self.process_storage_item(item)
+            logger.info(f"Processed {items_processed} price items in total.")
         
-        # Second pass: enrich with API, data transfer, and fee data
-        for item in all_price_items:
-            family = item.get('product', {}).get('productFamily')
-            sku = item.get('product', {}).get('sku')
-
-            if sku in processed_records: continue
-            
-            if family == 'API Request':
-                self.process_api_request_item(item)
-                processed_records.add(sku)
-            elif family == 'Data Transfer':
-                self.process_data_transfer_item(item)
-                processed_records.add(sku)
-            elif family == 'Fee':
-                self.process_fee_item(item)
-                processed_records.add(sku)
-        
-        # Final step: write all the processed records to the CSV file
-        if self.storage_records_map:
-            logger.info(f"Writing {len(self.storage_records_map)} final records to CSV...")
-            self.append_batch_to_csv(list(self.storage_records_map.values()))
-        else:
-            logger.warning("No storage records were generated.")
+            # Final step: write all the processed records to the CSV file
+            if self.storage_records_map:
+                logger.info(f"Writing {len(self.storage_records_map)} final records to CSV...")
+                self.append_batch_to_csv(list(self.storage_records_map.values()))
+            else:
+                logger.warning("No storage records were generated.")
             
-        self.write_progress_summary()
-        logger.info("Data extraction completed!")
+            self.write_progress_summary()
+            logger.info("Data extraction completed!")
+        finally:
+            self.close()
 
 def main():
     import argparse
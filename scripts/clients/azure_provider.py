@@ -1,7 +1,8 @@
 import csv
 from enum import StrEnum
+from functools import lru_cache
 import os
-from typing import List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional
 from pydantic import BaseModel
 import requests
 from azure.identity import DefaultAzureCredential, ClientSecretCredential
@@ -42,7 +43,7 @@ class CloudCompute(BaseModel):
         "oceania",
         "antarctica",
     ]
-    other_details: Optional[dict] = None
+    other_details: Optional[Dict[str, Any]] = None
 
 class CloudStorage(BaseModel):
     storage_name: str
@@ -57,7 +58,7 @@ class CloudStorage(BaseModel):
         "oceania",
         "antarctica",
     ]
-    other_details: Optional[dict] = None
+    other_details: Optional[Dict[str, Any]] = None
 
 # Azure region mapping by geographical areas
 AZURE_REGION_MAPPING = {
@@ -154,6 +155,16 @@ AZURE_REGION_MAPPING = {
     Region.ANTARCTICA: [], # remove—no such region in Azure
 }
 
+# Flattened Azure region code -> geographical region value, built once at import
+AZURE_REGION_TO_GEO = {}
+for _geo_region, _region_list in AZURE_REGION_MAPPING.items():
+    for _region_code, _region_name in _region_list:
+        AZURE_REGION_TO_GEO[_region_code] = _geo_region.value
+
+# VM size patterns, compiled once for the per-item loops
+_VM_SIZE_RE = re.compile(r'([A-Za-z]+)(\d+)([a-z]*)(_v\d+)?')
+_VM_SERIES_RE = re.compile(r'([A-Za-z]+)(\d+)')
+
 # Azure VM series memory ratios (memory GB per vCPU)
 # These are typical ratios used by Azure for different VM series
 VM_SERIES_MEMORY_RATIO = {
@@ -186,17 +197,19 @@ client_secret   = os.getenv("AZURE_CLIENT_SECRET")
 tenant_id       = os.getenv("AZURE_TENANT_ID")
 subscription_id = os.getenv("AZURE_SUBSCRIPTION_ID")
 
-if all([tenant_id, client_id, client_secret]):
-    credential = ClientSecretCredential(tenant_id, client_id, client_secret)
-else:
-    credential = DefaultAzureCredential()
+@lru_cache(maxsize=1)
+def get_credential():
+    """Create the Azure credential on first use and reuse it afterwards."""
+    if all([tenant_id, client_id, client_secret]):
+        return ClientSecretCredential(tenant_id, client_id, client_secret)
+    return DefaultAzureCredential()
 
 
 class AzureProvider:
     def __init__(self):
         self.provider_name = "AZURE"
-        self.compute_client = ComputeManagementClient(credential, subscription_id)
-        self.storage_client = StorageManagementClient(credential, subscription_id)
+        self.compute_client = ComputeManagementClient(get_credential(), subscription_id)
+        self.storage_client = StorageManagementClient(get_credential(), subscription_id)
         self.prices_base_url = "https://prices.azure.com/api/retail/prices"
         self.vm_prices: List[CloudCompute] = []
         
@@ -347,12 +360,12 @@ class AzureProvider:
             
         # Extract series letter (like D, E, F, etc.)
         # Try different patterns to extract the series
-        series_match = re.search(r'([A-Za-z]+)(\d+)', vm_size)
+        series_match = _VM_SERIES_RE.search(vm_size)
         if not series_match:
             # Try alternative pattern for names like "Standard_D2s_v3"
             parts = vm_size.split('_')
             if len(parts) > 1:
-                series_match = re.search(r'([A-Za-z]+)(\d+)', parts[-1])
+                series_match = _VM_SERIES_RE.search(parts[-1])
                 
         if series_match:
             series = series_match.group(1).upper()
@@ -427,12 +440,6 @@ class AzureProvider:
         # 1. Call retail API without region filter to get all VMs
         vm_items = self._get_retail_price()
         
-        # 2. Create region mapping for easier lookup
-        azure_region_to_geo = {}
-        for geo_region, region_list in AZURE_REGION_MAPPING.items():
-            for region_code, region_name in region_list:
-                azure_region_to_geo[region_code] = geo_region.value
-        
         # Get VM specifications for sample regions
         # We don't need to query all regions as VM specs are often similar across regions
         sample_regions = ["eastus", "westeurope", "southeastasia", "australiaeast"]
@@ -446,7 +453,7 @@ class AzureProvider:
         
         print(f"Combined VM specifications: {len(combined_vm_specs)} unique VM types")
         
-        # 3. Process each VM item and create CloudCompute objects
+        # 2. Process each VM item and create CloudCompute objects
         cloud_compute_list = []
         matched_count = 0
         memory_from_specs_count = 0
@@ -459,7 +466,7 @@ class AzureProvider:
                 continue
                 
             # Map Azure region to our geographic region
-            geo_region = azure_region_to_geo.get(azure_region)
+            geo_region = AZURE_REGION_TO_GEO.get(azure_region)
             if not geo_region:
                 continue
             
@@ -524,7 +531,7 @@ class AzureProvider:
             
             # Try to extract VM size information from SKU name
             # Example: Standard_D2s_v3 has 2 vCPUs
-            vm_size_match = re.search(r'([A-Za-z]+)(\d+)([a-z]*)(_v\d+)?', sku_name)
+            vm_size_match = _VM_SIZE_RE.search(sku_name)
             if vm_size_match:
                 try:
                     cpu_count = int(vm_size_match.group(2))
@@ -705,11 +712,11 @@ def main():
         with open(output_path, "w", newline="") as f:
             writer = csv.writer(f)
             # Write headers
-            writer.writerow(all_instances[0].model_dump().keys())
+            writer.writerow(CloudCompute.model_fields.keys())
             # Write data
             for instance in all_instances:
-                # Make a copy of the model data
-                instance_data = instance.model_dump()
+                # Shallow copy of the field values; model_dump() would deep-copy other_details
+                instance_data = dict(instance.__dict__)
                 # Convert other_details to JSON string if it exists
                 if instance_data.get('other_details'):
                     import json
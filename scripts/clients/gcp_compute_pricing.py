@@ -1,154 +1,293 @@
 import json
 import csv
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import httplib2
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
-from google.auth import default
+from gcp_sku_cache import get_credentials, load_skus
 
 # Set your actual GCP project ID
 PROJECT_ID = "fastapi-461018"
 SERVICE_ID = "6F81-5844-456A"
 
+# OS keywords scanned in a single pass ("win" also covers "windows", "windows_", "windows-")
+_OS_RE = re.compile(r'win|linux|ubuntu|debian|centos|rhel|sles', re.IGNORECASE)
+
+# Machine families in match priority order (N2D before N2, C4A/C4D before C4, etc.)
+_MACHINE_FAMILIES = [
+    "M1", "M2", "M3", "M4", "N1", "N2D", "N2", "N4", "C2D", "C2", "C3D", "C3",
+    "C4A", "C4D", "C4", "E2", "Z3", "H3", "X4", "A4X", "A4", "A3", "A2", "G2",
+    "Tau T2A", "Tau T2D",
+]
+_MACHINE_PRIORITY = {family: i for i, family in enumerate(_MACHINE_FAMILIES)}
+
+# One scan over the description for every family. Families may be part of a larger word
+# (like M4Ultramem224), so an uppercase letter also ends the token. Trailing characters are
+# only looked at, not consumed, so a family starting inside them is still found.
+_MACHINE_RE = re.compile(
+    r'(' + '|'.join(f for f in _MACHINE_FAMILIES if not f.startswith("Tau")) + r')(?:\b|(?=[A-Z]))'
+    r'|Tau\s+(?=(T2A|T2D))'
+)
+
+# Instance name prefixes (e.g. 'a2-highgpu-1g') mapped to machine names
+_INSTANCE_PREFIXES = {
+    "n4": "N4", "n2d": "N2D", "n2": "N2", "n1": "N1", "c4a": "C4A", "c4d": "C4D", "c4": "C4",
+    "c3d": "C3D", "c3": "C3", "e2": "E2", "t2a": "Tau T2A", "t2d": "Tau T2D", "z3": "Z3",
+    "h3": "H3", "c2d": "C2D", "c2": "C2", "x4": "X4", "m4": "M4", "m3": "M3", "m2": "M2",
+    "m1": "M1", "a4x": "A4X", "a4": "A4", "a3": "A3", "a2": "A2", "g2": "G2",
+}
+
+# Patterns used by extract_specs_from_description. GPU count, vCPU count and RAM are read
+# in one scan; none of them can start inside another's match, so the first match of each
+# kind is the same one a separate search would find.
+_SPECS_RE = re.compile(r'(?P<gpu>\d+)\s+GPU|(?P<vcpu>\d+)\s+vCPU|(?P<ram>[\d.]+)\s+GB', re.IGNORECASE)
+_GPU_MEMORY_RE = re.compile(r'(\d+)\s*GB\s+GPU', re.IGNORECASE)
+
+# Common NVIDIA GPU models used in GCP, tried in order
+_GPU_MODEL_PATTERNS = [
+    (re.compile(p, re.IGNORECASE), extract_func) for p, extract_func in [
+        (r'NVIDIA\s+Tesla\s+[A-Za-z0-9]+', lambda m: m.group(0)),  # NVIDIA Tesla X
+        (r'NVIDIA\s+Tesla\s+[A-Za-z]\d+', lambda m: m.group(0)),   # NVIDIA Tesla V100, T4, etc.
+        (r'NVIDIA\s+[A-Za-z]\d+', lambda m: m.group(0)),           # NVIDIA V100, T4, etc.
+        (r'NVIDIA\s+H100', lambda m: "NVIDIA H100"),               # NVIDIA H100
+        (r'NVIDIA\s+A100', lambda m: "NVIDIA A100"),               # NVIDIA A100
+        (r'NVIDIA\s+P100', lambda m: "NVIDIA P100"),               # NVIDIA P100
+        (r'NVIDIA\s+P4', lambda m: "NVIDIA P4"),                   # NVIDIA P4
+        (r'NVIDIA\s+T4', lambda m: "NVIDIA T4"),                   # NVIDIA T4
+        (r'NVIDIA\s+V100', lambda m: "NVIDIA V100"),               # NVIDIA V100
+        (r'NVIDIA\s+K80', lambda m: "NVIDIA K80"),                 # NVIDIA K80
+        (r'NVIDIA\s+L4', lambda m: "NVIDIA L4")                    # NVIDIA L4
+    ]
+]
+
+# Shared read-only default for missing nested fields, so lookups don't allocate a new {}
+_EMPTY = {}
+
+# Keywords that exclude a SKU from the on-demand price list
+EXCLUDE_KEYWORDS = ['Reserved', 'DWS', 'Spot', 'Sole Tenancy', 'License', 'Committed', 'Storage', 'Local SSD', 'Burstable']
+_EXCLUDE_KEYWORDS_LOWER = tuple(keyword.lower() for keyword in EXCLUDE_KEYWORDS)
+
+# Concurrent zone requests when listing machine types
+MAX_FETCH_WORKERS = 16
+
+# Rows buffered before each writerows call
+CSV_BATCH_SIZE = 4096
+
+# Write buffer for output CSV files (1 MiB instead of the 8 KiB default)
+CSV_WRITE_BUFFER = 1024 * 1024
+
 def fetch_raw_skus(service_id):
-    credentials, _ = default()
-    billing = build("cloudbilling", "v1", credentials=credentials)
-    skus = []
-    request = billing.services().skus().list(parent=f"services/{service_id}")
+    return load_skus(service_id)
+
+@lru_cache(maxsize=1)
+def _get_compute():
+    return build("compute", "v1", credentials=get_credentials(), cache_discovery=False)
 
+def _fetch_zone_machine_specs(project_id, zone):
+    # httplib2 connections are not thread-safe, so every zone gets its own authorized transport
+    compute = _get_compute()
+    http = AuthorizedHttp(get_credentials(), http=httplib2.Http())
+    request = compute.machineTypes().list(project=project_id, zone=zone)
+
+    machines = []
     while request is not None:
-        response = request.execute()
-        skus.extend(response.get("skus", []))
-        request = billing.services().skus().list_next(previous_request=request, previous_response=response)
+        response = request.execute(http=http)
+        for machine in response.get("items", []):
+            machine["zone_scope"] = f"zones/{zone}"
+            machines.append(machine)
+        request = compute.machineTypes().list_next(previous_request=request, previous_response=response)
 
-    return skus
+    return machines
 
 def fetch_raw_machine_specs(project_id):
-    credentials, _ = default()
-    compute = build("compute", "v1", credentials=credentials)
-    request = compute.machineTypes().aggregatedList(project=project_id)
+    compute = _get_compute()
+    request = compute.zones().list(project=project_id)
 
-    machines = []
+    zones = []
     while request is not None:
         response = request.execute()
-        for zone, data in response.get("items", {}).items():
-            for machine in data.get("machineTypes", []):
-                machine["zone_scope"] = zone
-                machines.append(machine)
-        request = compute.machineTypes().aggregatedList_next(previous_request=request, previous_response=response)
+        zones.extend(zone["name"] for zone in response.get("items", []))
+        request = compute.zones().list_next(previous_request=request, previous_response=response)
+
+    # Machine types are listed zone by zone in parallel instead of paging through aggregatedList
+    machines = []
+    with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+        for zone_machines in executor.map(lambda zone: _fetch_zone_machine_specs(project_id, zone), zones):
+            machines.extend(zone_machines)
 
     return machines
 
-def save_skus_to_csv(skus, filename):
-    with open(filename, "w", newline='', encoding="utf-8") as f:
-        writer = csv.writer(f)
+def _parse_sku(sku):
+    """
+    Extract the pricing fields of a single raw SKU.
+    
+    Args:
+        sku: Raw SKU dictionary from the GCP Billing API
+        
+    Returns:
+        "filtered" for non-OnDemand SKUs, "excluded" for SKUs matching an exclude keyword,
+        otherwise a dictionary of parsed fields plus the SKU's list of regions
+    """
+    # Direct key access on the common path; only SKUs without a category pay for the fallback
+    try:
+        category = sku["category"]
+    except KeyError:
+        category = _EMPTY
+    
+    # Check if this is an OnDemand SKU
+    usage_type = category.get("usageType", "")
+    if "OnDemand" not in usage_type:
+        return "filtered"
+    
+    description = sku.get("description", "")
+    description_lower = description.lower()
+    
+    # Check if description contains any of the exclude keywords
+    if any(keyword in description_lower for keyword in _EXCLUDE_KEYWORDS_LOWER):
+        return "excluded"
+        
+    pricing_info = sku.get("pricingInfo", [])
+    price_units = ""
+    price_nanos = ""
+    pricing_unit = ""
+    
+    # Extract machine name from description
+    machine_name = extract_machine_name(description)
+
+    if pricing_info:
+        pricing_expr = pricing_info[0].get("pricingExpression", _EMPTY)
+        pricing_unit = pricing_expr.get("usageUnit", "")
+        tiered_rates = pricing_expr.get("tieredRates", [])
+        if tiered_rates:
+            unit_price = tiered_rates[0].get("unitPrice", _EMPTY)
+            price_units = unit_price.get("units", "")
+            price_nanos = unit_price.get("nanos", "")
+    
+    # Convert to actual dollars
+    price_dollars = convert_price_to_dollars(price_units, price_nanos)
+    
+    # Check if we need to convert the price to hourly rate
+    # GCP pricing can be in different units (h = hourly, mo = monthly, etc.)
+    if pricing_unit == "mo":  # Monthly price
+        # Convert monthly price to hourly (divide by average hours in month)
+        price_dollars = price_dollars / (30.44 * 24)  # 30.44 average days per month * 24 hours
+    elif pricing_unit == "d":  # Daily price
+        # Convert daily price to hourly
+        price_dollars = price_dollars / 24
+    # Other units like 'GiBy.h' (GiB per hour) don't need conversion for hourly rate
+    
+    # Determine OS type and SKU type
+    resource_group = category.get("resourceGroup", "")
+    
+    return {
+        "name": sku.get("name"),
+        "description": description,
+        "machine_name": machine_name,
+        "category_resourceGroup": resource_group,
+        "category_usageType": usage_type,  # Always present here, OnDemand SKUs carry a usage type
+        "category_serviceDisplayName": category.get("serviceDisplayName"),
+        "pricing_unit": pricing_unit,
+        "price_units": price_units,
+        "price_nanos": price_nanos,
+        "price_dollars_hourly": price_dollars,
+        "os_type": determine_os_type(resource_group, description),
+        "sku_type": determine_sku_type(description),
+        "regions": sku.get("serviceRegions", [])
+    }
+
+def parse_skus(skus):
+    """
+    Parse raw SKUs into a list that several writers can iterate.
+    
+    Parsing runs in this process: each SKU only takes a few regex calls, less
+    than it would cost to pickle it to a worker process.
+    
+    Args:
+        skus: Iterable of raw SKU dictionaries from the GCP Billing API
+        
+    Returns:
+        List of _parse_sku results (one per SKU), in the same order as the input SKUs
+    """
+    return [_parse_sku(sku) for sku in skus]
+
+def _csv_field(value):
+    """Format one CSV field the way csv.writer's default (QUOTE_MINIMAL) dialect does."""
+    if value is None:
+        return ""
+    text = value if isinstance(value, str) else str(value)
+    if ',' in text or '"' in text or '\n' in text or '\r' in text:
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+def save_skus_to_csv(parsed_skus, filename):
+    """
+    Write parsed SKUs to a CSV file, one row per region.
+    
+    Args:
+        parsed_skus: Iterable of parse_skus results
+        filename: Path of the CSV file to write
+    """
+    with open(filename, "w", newline='', encoding="utf-8", buffering=CSV_WRITE_BUFFER) as f:
         header = [
             "name", "description", "machine_name", "category_resourceGroup", "category_usageType",
             "category_serviceDisplayName", "region", "pricing_unit", "price_units", "price_nanos", 
             "price_dollars_hourly", "os_type", "sku_type"
         ]
-        writer.writerow(header)
-
-        # Define keywords to exclude
-        exclude_keywords = ['Reserved', 'DWS', 'Spot', 'Sole Tenancy', 'License', 'Committed', 'Storage', 'Local SSD', 'Burstable']
+        f.write(",".join(header) + "\r\n")
 
         total_rows = 0
         filtered_skus = 0
         excluded_by_keywords = 0
+        sku_count = 0
+        lines = []
         
-        for sku in skus:
-            # Check if this is an OnDemand SKU
-            usage_type = sku.get("category", {}).get("usageType", "")
-            if "OnDemand" not in usage_type:
+        for parsed in parsed_skus:
+            sku_count += 1
+            if parsed == "filtered":
                 filtered_skus += 1
                 continue
-            
-            description = sku.get("description", "")
-            
-            # Check if description contains any of the exclude keywords
-            if any(keyword.lower() in description.lower() for keyword in exclude_keywords):
+            if parsed == "excluded":
                 excluded_by_keywords += 1
                 continue
-                
-            pricing_info = sku.get("pricingInfo", [])
-            price_units = ""
-            price_nanos = ""
-            pricing_unit = ""
-            
-            # Extract machine name from description
-            machine_name = extract_machine_name(description)
-
-            if pricing_info:
-                pricing_expr = pricing_info[0].get("pricingExpression", {})
-                pricing_unit = pricing_expr.get("usageUnit", "")
-                tiered_rates = pricing_expr.get("tieredRates", [])
-                if tiered_rates:
-                    unit_price = tiered_rates[0].get("unitPrice", {})
-                    price_units = unit_price.get("units", "")
-                    price_nanos = unit_price.get("nanos", "")
             
-            # Convert to actual dollars
-            price_dollars = convert_price_to_dollars(price_units, price_nanos)
+            # Columns before and after the region are the same for every region of a SKU,
+            # so they are escaped and joined once and only the region changes per row
+            before_region = ",".join(map(_csv_field, [
+                parsed["name"],
+                parsed["description"],
+                parsed["machine_name"],
+                parsed["category_resourceGroup"],
+                parsed["category_usageType"],
+                parsed["category_serviceDisplayName"],
+            ]))
+            after_region = ",".join(map(_csv_field, [
+                parsed["pricing_unit"],
+                parsed["price_units"],
+                parsed["price_nanos"],
+                f"{parsed['price_dollars_hourly']:.9f}",  # Format with 9 decimal places for precision - hourly price in USD
+                parsed["os_type"],
+                parsed["sku_type"]
+            ]))
             
-            # Check if we need to convert the price to hourly rate
-            # GCP pricing can be in different units (h = hourly, mo = monthly, etc.)
-            if pricing_unit == "mo":  # Monthly price
-                # Convert monthly price to hourly (divide by average hours in month)
-                price_dollars = price_dollars / (30.44 * 24)  # 30.44 average days per month * 24 hours
-            elif pricing_unit == "d":  # Daily price
-                # Convert daily price to hourly
-                price_dollars = price_dollars / 24
-            # Other units like 'GiBy.h' (GiB per hour) don't need conversion for hourly rate
+            # If no regions, add a row with empty region; otherwise one row per region
+            for region in parsed["regions"] or [""]:
+                lines.append(f"{before_region},{_csv_field(region)},{after_region}\r\n")
             
-            # Determine OS type and SKU type
-            resource_group = sku.get("category", {}).get("resourceGroup", "")
-            os_type = determine_os_type(resource_group, description)
-            sku_type = determine_sku_type(description)
-            
-            # Get list of regions
-            regions = sku.get("serviceRegions", [])
-            
-            # If no regions, add a row with empty region
-            if not regions:
-                writer.writerow([
-                    sku.get("name"),
-                    description,
-                    machine_name,
-                    resource_group,
-                    sku.get("category", {}).get("usageType"),
-                    sku.get("category", {}).get("serviceDisplayName"),
-                    "",  # Empty region
-                    pricing_unit,
-                    price_units,
-                    price_nanos,
-                    f"{price_dollars:.9f}",  # Format with 9 decimal places for precision - hourly price in USD
-                    os_type,
-                    sku_type
-                ])
-                total_rows += 1
-            else:
-                # Create a separate row for each region
-                for region in regions:
-                    writer.writerow([
-                        sku.get("name"),
-                        description,
-                        machine_name,
-                        resource_group,
-                        sku.get("category", {}).get("usageType"),
-                        sku.get("category", {}).get("serviceDisplayName"),
-                        region,  # Individual region
-                        pricing_unit,
-                        price_units,
-                        price_nanos,
-                        f"{price_dollars:.9f}",  # Format with 9 decimal places for precision - hourly price in USD
-                        os_type,
-                        sku_type
-                    ])
-                    total_rows += 1
+            if len(lines) >= CSV_BATCH_SIZE:
+                f.writelines(lines)
+                total_rows += len(lines)
+                lines.clear()
+        
+        f.writelines(lines)
+        total_rows += len(lines)
 
     print(f"Saved raw SKUs to {filename} with {total_rows} rows")
-    print(f"Filtered out {filtered_skus} non-OnDemand SKUs and {excluded_by_keywords} SKUs with excluded keywords from {len(skus)} total SKUs")
+    print(f"Filtered out {filtered_skus} non-OnDemand SKUs and {excluded_by_keywords} SKUs with excluded keywords from {sku_count} total SKUs")
 
 def save_machine_specs_to_csv(machines, filename):
-    with open(filename, "w", newline='', encoding="utf-8") as f:
+    with open(filename, "w", newline='', encoding="utf-8", buffering=CSV_WRITE_BUFFER) as f:
         writer = csv.writer(f)
         header = [
             "name", "machine_name", "description", "guestCpus", "memoryMb", "gpu_count", "gpu_name", "gpu_memory_per_gpu", "vcpu_info", "ram_info",
@@ -156,7 +295,10 @@ def save_machine_specs_to_csv(machines, filename):
         ]
         writer.writerow(header)
 
+        rows = []
+        machine_count = 0
         for m in machines:
+            machine_count += 1
             description = m.get("description", "")
             zone_scope = m.get("zone_scope", "")
             name = m.get("name", "")
@@ -177,7 +319,7 @@ def save_machine_specs_to_csv(machines, filename):
             # Determine CPU architecture
             cpu_arch = determine_cpu_architecture(name, description)
             
-            writer.writerow([
+            rows.append([
                 m.get("name"),
                 machine_name,  # Add the extracted machine name
                 description,
@@ -190,74 +332,36 @@ def save_machine_specs_to_csv(machines, filename):
                 specs["ram_info"] or str(round(m.get("memoryMb", 0) / 1024, 2)),  # Convert memoryMb to GB if not found
                 region,
                 zone_scope,  # Keep original zone for reference
-                m.get("deprecated", {}).get("state", ""),
+                m.get("deprecated", _EMPTY).get("state", ""),
                 m.get("isSharedCpu", False),
                 cpu_arch  # Add CPU architecture
             ])
+            
+            if len(rows) >= CSV_BATCH_SIZE:
+                writer.writerows(rows)
+                rows.clear()
+        
+        writer.writerows(rows)
 
-    print(f"Saved raw machine specs to {filename} with {len(machines)} entries")
+    print(f"Saved raw machine specs to {filename} with {machine_count} entries")
 
 def extract_machine_name(description):
     """Extract machine name from description."""
     if not description:
         return ""
-        
-    # For machine types that might be part of a larger word (like M4Ultramem224)
-    if re.search(r'M1(?:\b|[A-Z])', description):
-        return "M1"
-    if re.search(r'M2(?:\b|[A-Z])', description):
-        return "M2"
-    if re.search(r'M3(?:\b|[A-Z])', description):
-        return "M3"
-    if re.search(r'M4(?:\b|[A-Z])', description):
-        return "M4"
-    if re.search(r'N1(?:\b|[A-Z])', description):
-        return "N1"
-    if re.search(r'N2D(?:\b|[A-Z])', description): # Check N2D before N2
-        return "N2D"
-    if re.search(r'N2(?:\b|[A-Z])', description):
-        return "N2"
-    if re.search(r'N4(?:\b|[A-Z])', description):
-        return "N4"
-    if re.search(r'C2D(?:\b|[A-Z])', description): # Check C2D before C2
-        return "C2D"
-    if re.search(r'C2(?:\b|[A-Z])', description):
-        return "C2"
-    if re.search(r'C3D(?:\b|[A-Z])', description): # Check C3D before C3
-        return "C3D"
-    if re.search(r'C3(?:\b|[A-Z])', description):
-        return "C3"
-    if re.search(r'C4A(?:\b|[A-Z])', description): # Check C4A and C4D before C4
-        return "C4A"
-    if re.search(r'C4D(?:\b|[A-Z])', description):
-        return "C4D"
-    if re.search(r'C4(?:\b|[A-Z])', description):
-        return "C4"
-    if re.search(r'E2(?:\b|[A-Z])', description):
-        return "E2"
-    if re.search(r'Z3(?:\b|[A-Z])', description):
-        return "Z3"
-    if re.search(r'H3(?:\b|[A-Z])', description):
-        return "H3"
-    if re.search(r'X4(?:\b|[A-Z])', description):
-        return "X4"
-    if re.search(r'A4X(?:\b|[A-Z])', description): # Check A4X before A4
-        return "A4X"
-    if re.search(r'A4(?:\b|[A-Z])', description):
-        return "A4"
-    if re.search(r'A3(?:\b|[A-Z])', description):
-        return "A3"
-    if re.search(r'A2(?:\b|[A-Z])', description):
-        return "A2"
-    if re.search(r'G2(?:\b|[A-Z])', description):
-        return "G2"
-    if re.search(r'Tau\s+T2A', description):
-        return "Tau T2A"
-    if re.search(r'Tau\s+T2D', description):
-        return "Tau T2D"
+    
+    # Several families can appear in one description; the earliest entry in _MACHINE_FAMILIES wins
+    best = None
+    for match in _MACHINE_RE.finditer(description):
+        family = match.group(1) or f"Tau {match.group(2)}"
+        priority = _MACHINE_PRIORITY[family]
+        if best is None or priority < _MACHINE_PRIORITY[best]:
+            best = family
+            if priority == 0:
+                break
     
     # If nothing matches, return empty string (null)
-    return ""
+    return best or ""
 
 def convert_price_to_dollars(price_units, price_nanos):
     """
@@ -299,30 +403,22 @@ def extract_specs_from_description(description):
     gpu_name = ""
     gpu_memory = 0.0
     
+    # Collect the first GPU, vCPU and RAM figures in a single pass over the description
+    found = {}
+    for match in _SPECS_RE.finditer(description):
+        found.setdefault(match.lastgroup, match.group(match.lastgroup))
+        if len(found) == 3:
+            break
+    
     # Extract GPU information
-    gpu_match = re.search(r'(\d+)\s+GPU', description, re.IGNORECASE)
-    if gpu_match:
-        gpu_count = int(gpu_match.group(1))
+    if "gpu" in found:
+        gpu_count = int(found["gpu"])
         
         # If GPU is present, try to extract the GPU model name
         # Look for common NVIDIA GPU models used in GCP
-        gpu_model_patterns = [
-            (r'NVIDIA\s+Tesla\s+[A-Za-z0-9]+', lambda m: m.group(0)),  # NVIDIA Tesla X
-            (r'NVIDIA\s+Tesla\s+[A-Za-z]\d+', lambda m: m.group(0)),   # NVIDIA Tesla V100, T4, etc.
-            (r'NVIDIA\s+[A-Za-z]\d+', lambda m: m.group(0)),           # NVIDIA V100, T4, etc.
-            (r'NVIDIA\s+H100', lambda m: "NVIDIA H100"),               # NVIDIA H100
-            (r'NVIDIA\s+A100', lambda m: "NVIDIA A100"),               # NVIDIA A100
-            (r'NVIDIA\s+P100', lambda m: "NVIDIA P100"),               # NVIDIA P100
-            (r'NVIDIA\s+P4', lambda m: "NVIDIA P4"),                   # NVIDIA P4
-            (r'NVIDIA\s+T4', lambda m: "NVIDIA T4"),                   # NVIDIA T4
-            (r'NVIDIA\s+V100', lambda m: "NVIDIA V100"),               # NVIDIA V100
-            (r'NVIDIA\s+K80', lambda m: "NVIDIA K80"),                 # NVIDIA K80
-            (r'NVIDIA\s+L4', lambda m: "NVIDIA L4")                    # NVIDIA L4
-        ]
-        
         # Try to match any of the GPU model patterns
-        for pattern, extract_func in gpu_model_patterns:
-            match = re.search(pattern, description, re.IGNORECASE)
+        for pattern, extract_func in _GPU_MODEL_PATTERNS:
+            match = pattern.search(description)
             if match:
                 gpu_name = extract_func(match)
                 break
@@ -332,7 +428,7 @@ def extract_specs_from_description(description):
             gpu_name = "NVIDIA GPU"  # Default to generic NVIDIA GPU
             
         # Try to extract GPU memory from description
-        gpu_memory_match = re.search(r'(\d+)\s*GB\s+GPU', description, re.IGNORECASE)
+        gpu_memory_match = _GPU_MEMORY_RE.search(description)
         if gpu_memory_match:
             # If description specifies GPU memory (e.g., "4 NVIDIA V100 16GB GPU")
             gpu_memory = float(gpu_memory_match.group(1))
@@ -341,14 +437,12 @@ def extract_specs_from_description(description):
             gpu_memory = get_gpu_memory_size(gpu_name)
     
     # Extract vCPU information if not already available
-    vcpu_match = re.search(r'(\d+)\s+vCPU', description, re.IGNORECASE)
-    if vcpu_match:
-        vcpu_info = vcpu_match.group(1)  # Just the number without "vCPUs"
+    if "vcpu" in found:
+        vcpu_info = found["vcpu"]  # Just the number without "vCPUs"
     
     # Extract RAM information
-    ram_match = re.search(r'([\d.]+)\s+GB', description, re.IGNORECASE)
-    if ram_match:
-        ram_info = ram_match.group(1)  # Just the number without "GB"
+    if "ram" in found:
+        ram_info = found["ram"]  # Just the number without "GB"
     
     return {
         "gpu_count": gpu_count,
@@ -364,54 +458,24 @@ def extract_region_from_zone(zone_scope):
         return ""
         
     # Remove 'zones/' prefix if present
-    zone = zone_scope.replace('zones/', '')
-    
-    # Extract region (usually first two parts of zone)
-    parts = zone.split('-')
-    if len(parts) >= 2:
-        return f"{parts[0]}-{parts[1]}"
-    
-    return zone
+    zone = zone_scope.removeprefix('zones/')
+    
+    # Extract region (usually first two parts of zone), slicing up to the second '-'
+    first_dash = zone.find('-')
+    if first_dash == -1:
+        return zone
+    second_dash = zone.find('-', first_dash + 1)
+    return zone if second_dash == -1 else zone[:second_dash]
 
 def extract_machine_name_from_instance(instance_name):
     """Extract machine name from instance name like 'a2-highgpu-1g'."""
     if not instance_name or not isinstance(instance_name, str):
         return ""
     
-    # Define patterns to match machine types in instance names
-    patterns = [
-        (r'^n4-', "N4"),
-        (r'^n2d-', "N2D"),
-        (r'^n2-', "N2"),
-        (r'^n1-', "N1"),
-        (r'^c4a-', "C4A"),
-        (r'^c4d-', "C4D"),
-        (r'^c4-', "C4"),
-        (r'^c3d-', "C3D"),
-        (r'^c3-', "C3"),
-        (r'^e2-', "E2"),
-        (r'^t2a-', "Tau T2A"),
-        (r'^t2d-', "Tau T2D"),
-        (r'^z3-', "Z3"),
-        (r'^h3-', "H3"),
-        (r'^c2d-', "C2D"),
-        (r'^c2-', "C2"),
-        (r'^x4-', "X4"),
-        (r'^m4-', "M4"),
-        (r'^m3-', "M3"),
-        (r'^m2-', "M2"),
-        (r'^m1-', "M1"),
-        (r'^a4x-', "A4X"),
-        (r'^a4-', "A4"),
-        (r'^a3-', "A3"),
-        (r'^a2-', "A2"),
-        (r'^g2-', "G2"),
-    ]
-    
-    # Check each pattern
-    for pattern, machine_type in patterns:
-        if re.search(pattern, instance_name.lower()):
-            return machine_type
+    # The machine family is everything before the first '-'
+    prefix, dash, _ = instance_name.lower().partition('-')
+    if dash:
+        return _INSTANCE_PREFIXES.get(prefix, "")
     
     # If no pattern matches, return empty string
     return ""
@@ -430,22 +494,22 @@ def determine_os_type(resource_group, description):
     if not resource_group and not description:
         return "OTHER"
     
-    # Convert to lowercase for case-insensitive matching
-    resource_lower = str(resource_group).lower() if resource_group else ""
-    desc_lower = str(description).lower() if description else ""
+    resource_text = str(resource_group) if resource_group else ""
+    desc_text = str(description) if description else ""
     
-    # Check for Windows indicators
-    if any(win_term in resource_lower or win_term in desc_lower for win_term in 
-           ["windows", "win", "windows_", "windows-"]):
-        return "WINDOWS"
+    # Windows indicators take precedence, so keep scanning after a Linux keyword
+    os_type = None
+    for match in _OS_RE.finditer(f"{resource_text} {desc_text}"):
+        if match.group(0).lower() == "win":
+            return "WINDOWS"
+        os_type = "LINUX"
     
-    # Check for Linux indicators
-    if any(linux_term in resource_lower or linux_term in desc_lower for linux_term in 
-           ["linux", "ubuntu", "debian", "centos", "rhel", "sles", "linux_", "linux-"]):
-        return "LINUX"
+    if os_type:
+        return os_type
     
     # For GCP Compute Engine, most non-Windows instances are Linux by default
-    if "compute" in resource_lower and "instance" in resource_lower and "windows" not in resource_lower:
+    resource_lower = resource_text.lower()
+    if "compute" in resource_lower and "instance" in resource_lower:
         return "LINUX"
     
     # Default to OTHER if we can't determine
@@ -707,7 +771,7 @@ def join_and_format_data(machine_specs_file, skus_file, output_file):
                     skipped_records += 1
     
     # Write the joined data to CSV
-    with open(output_file, "w", newline='', encoding="utf-8") as f:
+    with open(output_file, "w", newline='', encoding="utf-8", buffering=CSV_WRITE_BUFFER) as f:
         # Define the output fields according to the mapping
         fields = [
             "vm_name", "provider_name", "virtual_cpu_count", "memory_gb", "cpu_arch",
@@ -734,6 +798,14 @@ def create_output_record(machine, sku):
     Returns:
         A dictionary containing the mapped fields, or None if region should be skipped
     """
+    # Map the GCP region to a continent
+    gcp_region = machine.get("region", "")
+    continent = map_region_to_continent(gcp_region)
+    
+    # Skip unrecognized regions before doing any conversion work
+    if continent is None:
+        return None
+    
     # Extract and convert fields from the machine spec
     try:
         vcpu_count = int(machine.get("vcpu_info", "0") or machine.get("guestCpus", "0"))
@@ -755,14 +827,6 @@ def create_output_record(machine, sku):
     except ValueError:
         gpu_memory = 0.0
     
-    # Map the GCP region to a continent
-    gcp_region = machine.get("region", "")
-    continent = map_region_to_continent(gcp_region)
-    
-    # Skip this record if region is not recognized
-    if continent is None:
-        return None
-    
     # Create a record with fields from machine_specs
     record = {
         "vm_name": machine.get("name", ""),
@@ -824,6 +888,14 @@ def create_consolidated_output_record(machine, skus_by_unit_and_type, os_type="O
     Returns:
         A dictionary containing the mapped fields with combined pricing, or None if region should be skipped
     """
+    # Map the GCP region to a continent
+    gcp_region = machine.get("region", "")
+    continent = map_region_to_continent(gcp_region)
+    
+    # Skip unrecognized regions before doing any conversion work
+    if continent is None:
+        return None
+    
     # Extract and convert fields from the machine spec
     try:
         vcpu_count = int(machine.get("vcpu_info", "0") or machine.get("guestCpus", "0"))
@@ -845,14 +917,6 @@ def create_consolidated_output_record(machine, skus_by_unit_and_type, os_type="O
     except ValueError:
         gpu_memory = 0.0
     
-    # Map the GCP region to a continent
-    gcp_region = machine.get("region", "")
-    continent = map_region_to_continent(gcp_region)
-    
-    # Skip this record if region is not recognized
-    if continent is None:
-        return None
-    
     # Create a record with fields from machine_specs
     record = {
         "vm_name": machine.get("name", ""),
@@ -956,112 +1020,43 @@ def create_consolidated_output_record(machine, skus_by_unit_and_type, os_type="O
     
     return record
 
-def process_and_save_consolidated_data(skus, machines, output_file):
+def process_and_save_consolidated_data(parsed_skus, machines, output_file):
     """
     Process raw SKUs and machine specs data in memory and save directly to the consolidated output file
     without creating intermediate CSV files.
     
     Args:
-        skus: List of raw SKU dictionaries from the GCP Billing API
-        machines: List of raw machine dictionaries from the GCP Compute API
+        parsed_skus: Iterable of parse_skus results
+        machines: Iterable of raw machine dictionaries from the GCP Compute API
         output_file: Path where the consolidated data will be saved
     """
     print("Processing raw data and generating consolidated file...")
     
-    # Define keywords to exclude
-    exclude_keywords = ['Reserved', 'DWS', 'Spot', 'Sole Tenancy', 'License', 'Committed', 'Storage', 'Local SSD', 'Burstable']
-    
     # Process SKUs to extract relevant information
     processed_skus = []
     filtered_skus = 0
     excluded_by_keywords = 0
+    sku_count = 0
     
-    for sku in skus:
-        # Check if this is an OnDemand SKU
-        usage_type = sku.get("category", {}).get("usageType", "")
-        if "OnDemand" not in usage_type:
+    for parsed in parsed_skus:
+        sku_count += 1
+        if parsed == "filtered":
             filtered_skus += 1
             continue
-        
-        description = sku.get("description", "")
-        
-        # Check if description contains any of the exclude keywords
-        if any(keyword.lower() in description.lower() for keyword in exclude_keywords):
+        if parsed == "excluded":
             excluded_by_keywords += 1
             continue
-            
-        pricing_info = sku.get("pricingInfo", [])
-        price_units = ""
-        price_nanos = ""
-        pricing_unit = ""
         
-        # Extract machine name from description
-        machine_name = extract_machine_name(description)
-
-        if pricing_info:
-            pricing_expr = pricing_info[0].get("pricingExpression", {})
-            pricing_unit = pricing_expr.get("usageUnit", "")
-            tiered_rates = pricing_expr.get("tieredRates", [])
-            if tiered_rates:
-                unit_price = tiered_rates[0].get("unitPrice", {})
-                price_units = unit_price.get("units", "")
-                price_nanos = unit_price.get("nanos", "")
+        # Copy before dropping the regions, the parsed SKUs are shared with save_skus_to_csv
+        parsed = dict(parsed)
+        regions = parsed.pop("regions")
         
-        # Convert to actual dollars
-        price_dollars = convert_price_to_dollars(price_units, price_nanos)
-        
-        # Check if we need to convert the price to hourly rate
-        if pricing_unit == "mo":  # Monthly price
-            price_dollars = price_dollars / (30.44 * 24)  # 30.44 average days per month * 24 hours
-        elif pricing_unit == "d":  # Daily price
-            price_dollars = price_dollars / 24
-        
-        # Determine OS type and SKU type
-        resource_group = sku.get("category", {}).get("resourceGroup", "")
-        os_type = determine_os_type(resource_group, description)
-        sku_type = determine_sku_type(description)
-        
-        # Get list of regions
-        regions = sku.get("serviceRegions", [])
-        
-        # If no regions, add with empty region
-        if not regions:
-            processed_skus.append({
-                "name": sku.get("name"),
-                "description": description,
-                "machine_name": machine_name,
-                "category_resourceGroup": resource_group,
-                "category_usageType": sku.get("category", {}).get("usageType"),
-                "category_serviceDisplayName": sku.get("category", {}).get("serviceDisplayName"),
-                "region": "",
-                "pricing_unit": pricing_unit,
-                "price_units": price_units,
-                "price_nanos": price_nanos,
-                "price_dollars_hourly": price_dollars,
-                "os_type": os_type,
-                "sku_type": sku_type
-            })
-        else:
-            # Create a separate entry for each region
-            for region in regions:
-                processed_skus.append({
-                    "name": sku.get("name"),
-                    "description": description,
-                    "machine_name": machine_name,
-                    "category_resourceGroup": resource_group,
-                    "category_usageType": sku.get("category", {}).get("usageType"),
-                    "category_serviceDisplayName": sku.get("category", {}).get("serviceDisplayName"),
-                    "region": region,
-                    "pricing_unit": pricing_unit,
-                    "price_units": price_units,
-                    "price_nanos": price_nanos,
-                    "price_dollars_hourly": price_dollars,
-                    "os_type": os_type,
-                    "sku_type": sku_type
-                })
+        # If no regions, add with empty region; otherwise one entry per region
+        for region in regions or [""]:
+            processed_skus.append({**parsed, "region": region})
     
     print(f"Processed {len(processed_skus)} SKUs")
-    print(f"Filtered out {filtered_skus} non-OnDemand SKUs and {excluded_by_keywords} SKUs with excluded keywords from {len(skus)} total SKUs")
+    print(f"Filtered out {filtered_skus} non-OnDemand SKUs and {excluded_by_keywords} SKUs with excluded keywords from {sku_count} total SKUs")
     
     # Process machine specs
     processed_machines = []
@@ -1100,7 +1095,7 @@ def process_and_save_consolidated_data(skus, machines, output_file):
             "ram_info": specs["ram_info"] or str(round(m.get("memoryMb", 0) / 1024, 2)),
             "region": region,
             "zone": zone_scope,
-            "deprecationStatus": m.get("deprecated", {}).get("state", ""),
+            "deprecationStatus": m.get("deprecated", _EMPTY).get("state", ""),
             "isSharedCpu": m.get("isSharedCpu", False),
             "cpu_arch": cpu_arch
         })
@@ -1137,7 +1132,7 @@ def process_and_save_consolidated_data(skus, machines, output_file):
         region = machine.get("region", "")  # This is the original GCP region code
         
         # Look up matching SKUs
-        matching_skus_by_os = sku_lookup.get((machine_name, region), {})
+        matching_skus_by_os = sku_lookup.get((machine_name, region), _EMPTY)
         
         # If no matching SKUs, include the machine with null pricing
         if not matching_skus_by_os:
@@ -1156,7 +1151,7 @@ def process_and_save_consolidated_data(skus, machines, output_file):
                     skipped_records += 1
     
     # Write the joined data to CSV
-    with open(output_file, "w", newline='', encoding="utf-8") as f:
+    with open(output_file, "w", newline='', encoding="utf-8", buffering=CSV_WRITE_BUFFER) as f:
         # Define the output fields according to the mapping
         fields = [
             "vm_name", "provider_name", "virtual_cpu_count", "memory_gb", "cpu_arch",
@@ -1173,20 +1168,28 @@ def process_and_save_consolidated_data(skus, machines, output_file):
         print(f"Skipped {skipped_records} records with unrecognized regions")
 
 if __name__ == "__main__":
-    print(f"Fetching real-time SKUs for service ID: {SERVICE_ID}")
-    skus = fetch_raw_skus(SERVICE_ID)
+    # The billing and compute fetches are independent network calls, so run them side by side
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        print(f"Fetching real-time SKUs for service ID: {SERVICE_ID}")
+        skus_future = executor.submit(fetch_raw_skus, SERVICE_ID)
+        
+        print(f"Fetching Compute Engine machine specs for project: {PROJECT_ID}")
+        machines_future = executor.submit(fetch_raw_machine_specs, PROJECT_ID)
+        
+        skus = skus_future.result()
+        machines = machines_future.result()
     
-    print(f"Fetching Compute Engine machine specs for project: {PROJECT_ID}")
-    machines = fetch_raw_machine_specs(PROJECT_ID)
+    # Parse the SKUs once; both the raw and the consolidated file are built from them
+    parsed_skus = parse_skus(skus)
     
     # Save separate files first
     print("Generating separate CSV files...")
-    save_skus_to_csv(skus, "raw_skus.csv")
+    save_skus_to_csv(parsed_skus, "raw_skus.csv")
     save_machine_specs_to_csv(machines, "raw_machine_specs.csv")
     
     # Then create the consolidated file
     print("Generating consolidated file...")
-    process_and_save_consolidated_data(skus, machines, "gcp_compute_pricing.csv")
+    process_and_save_consolidated_data(parsed_skus, machines, "gcp_compute_pricing.csv")
     
     print("All files generated successfully!")
     print("- raw_skus.csv: Contains pricing information")
@@ -0,0 +1,96 @@
+"""
+Shared SKU listing for the GCP pricing extractors, with an on-disk cache.
+
+Both gcp_compute_pricing.py and gcp_storage_pricing_final.py page through the
+Cloud Billing catalog. Loading SKUs through this module means each service's
+catalog is fetched at most once per TTL window, whichever script runs first.
+"""
+
+import json
+import os
+import time
+import logging
+from functools import lru_cache
+from google.auth import default
+from googleapiclient.discovery import build
+
+logger = logging.getLogger(__name__)
+
+# Default cache lifetime: 6 hours
+DEFAULT_TTL = 6 * 60 * 60
+
+# Cache directory, overridable through the environment
+CACHE_DIR = os.environ.get(
+    "GCP_SKU_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "cloud-cost-explorer"),
+)
+
+def _cache_path(service_id):
+    return os.path.join(CACHE_DIR, f"gcp_skus_{service_id}.json")
+
+@lru_cache(maxsize=1)
+def get_credentials():
+    """Resolve Application Default Credentials once per process."""
+    creds, project = default()
+    logger.info("Using credentials for project: %s", project)
+    return creds
+
+@lru_cache(maxsize=1)
+def _get_billing():
+    return build("cloudbilling", "v1", credentials=get_credentials(), cache_discovery=False)
+
+def _fetch_skus(service_id):
+    """Page through the Cloud Billing API and return every SKU for the service."""
+    billing = _get_billing()
+
+    skus = []
+    request = billing.services().skus().list(parent=f"services/{service_id}", pageSize=500)
+    while request is not None:
+        response = request.execute()
+        batch = response.get("skus", [])
+        skus.extend(batch)
+        logger.info("Fetched %d SKUs, %d total so far", len(batch), len(skus))
+        request = billing.services().skus().list_next(previous_request=request, previous_response=response)
+
+    return skus
+
+def load_skus(service_id, ttl=DEFAULT_TTL, cache=True):
+    """
+    Load all SKUs for a GCP billing service, reusing a cached copy when fresh.
+
+    Args:
+        service_id: GCP billing service ID (e.g. "6F81-5844-456A" for Compute Engine)
+        ttl: Maximum age of the cached copy in seconds
+        cache: Set to False to always fetch from the API and skip the cache
+
+    Returns:
+        List of raw SKU dictionaries
+    """
+    path = _cache_path(service_id)
+
+    if cache:
+        try:
+            if time.time() - os.path.getmtime(path) < ttl:
+                with open(path, encoding="utf-8") as f:
+                    skus = json.load(f)
+                logger.info("Loaded %d cached SKUs for service %s from %s", len(skus), service_id, path)
+                return skus
+        except (OSError, ValueError) as e:
+            logger.info("No usable SKU cache for service %s: %s", service_id, e)
+
+    logger.info("Fetching all SKUs for service %s...", service_id)
+    skus = _fetch_skus(service_id)
+    logger.info("Completed fetching %d SKUs", len(skus))
+
+    if cache:
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            # Write to a temporary file first so readers never see a partial cache
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(skus, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Could not write SKU cache to %s: %s", path, e)
+
+    return skus
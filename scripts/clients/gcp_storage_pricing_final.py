@@ -9,9 +9,8 @@ import re
 import os
 import sys
 from datetime import datetime
-from google.auth import default
-from googleapiclient.discovery import build
 import logging
+from gcp_sku_cache import load_skus
 
 # Setup basic logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
@@ -188,7 +187,7 @@ def get_continent_from_region(region_code):
         return "asia"
     
     # Default to global if no match
-    logger.warning(f"Could not map region {region_code} to a continent, using 'global'")
+    logger.warning("Could not map region %s to a continent, using 'global'", region_code)
     return "global"
 
 def check_directory_permissions(dir_path):
@@ -201,54 +200,27 @@ def check_directory_permissions(dir_path):
         os.remove(test_file)
         return True
     except Exception as e:
-        logger.error(f"No write permission to directory {dir_path}: {e}")
+        logger.error("No write permission to directory %s: %s", dir_path, e)
         return False
 
 def fetch_all_skus():
-    """Yields every SKU under our GCS service."""
+    """Returns every SKU under our GCS service, using the shared SKU cache."""
     try:
-        logger.info(f"Authenticating with Google Cloud...")
-        creds, project = default()
-        logger.info(f"Using credentials for project: {project}")
-        
-        logger.info(f"Building Cloud Billing client...")
-        svc = build("cloudbilling", "v1", credentials=creds, cache_discovery=False)
-        
-        logger.info(f"Fetching all SKUs for service {SERVICE_ID}...")
-        req = svc.services().skus().list(parent=f"services/{SERVICE_ID}", pageSize=500)
-        count = 0
-        
-        while req:
-            resp = req.execute()
-            batch = resp.get("skus", [])
-            count += len(batch)
-            logger.info(f"Fetched {len(batch)} SKUs, {count} total so far")
-            
-            for sku in batch:
-                yield sku
-                
-            req = svc.services().skus().list_next(req, resp)
-            
-        logger.info(f"Completed fetching {count} SKUs")
-            
+        return load_skus(SERVICE_ID)
     except Exception as e:
-        logger.error(f"Error fetching SKUs: {e}")
+        logger.error("Error fetching SKUs: %s", e)
         raise
 
 # ─── MAIN ─────────────────────────────────────────────────────────────────────
 
 def process_capacity_skus(skus):
-    """Process capacity pricing SKUs and return base records."""
+    """Process on-demand storage capacity SKUs and return base records."""
     records = {}  # key = (region, storage_class)
     capacity_count = 0
     
     logger.info("Processing capacity SKUs...")
     
     for sku in skus:
-        cat = sku.get("category", {})
-        if cat.get("resourceFamily") != "Storage" or cat.get("usageType") != "OnDemand":
-            continue
-
         pe = sku["pricingInfo"][0]["pricingExpression"]
         unit = pe.get("usageUnit", "").lower()
         
@@ -263,7 +235,7 @@ def process_capacity_skus(skus):
         )
         
         desc = sku.get("description", "").lower()
-        sc = normalize_class(cat.get("resourceGroup", ""))
+        sc = normalize_class(sku["category"].get("resourceGroup", ""))
         svc = f"Google Cloud Storage - {sc.title()}"
         tier = TIER_MAP[sc]
 
@@ -294,7 +266,7 @@ def process_capacity_skus(skus):
                 "other_details": json.dumps(details, separators=(",", ":"), ensure_ascii=True),
             }
     
-    logger.info(f"Found {capacity_count} capacity SKUs, created {len(records)} base records")
+    logger.info("Found %d capacity SKUs, created %d base records", capacity_count, len(records))
     
     # Group regions by type to help with operation matching, but preserve original region codes
     region_types = {}
@@ -323,12 +295,12 @@ def process_capacity_skus(skus):
             
         region_types[region_type][storage_class].append(region_key)
     
-    logger.info(f"Region types: {region_types.keys()}")
+    logger.info("Region types: %s", region_types.keys())
     
     return records, region_types
 
 def process_operations_skus(skus, records, region_types):
-    """Process operations SKUs to add read/write pricing."""
+    """Process on-demand storage operations SKUs to add read/write pricing."""
     operations_found = 0
     class_a_found = 0
     class_b_found = 0
@@ -341,10 +313,6 @@ def process_operations_skus(skus, records, region_types):
     logger.info("Processing operations SKUs...")
     
     for sku in skus:
-        cat = sku.get("category", {})
-        if cat.get("resourceFamily") != "Storage" or cat.get("usageType") != "OnDemand":
-            continue
-
         desc = sku.get("description", "").lower()
         
         # Skip SKUs that aren't operations
@@ -379,14 +347,14 @@ def process_operations_skus(skus, records, region_types):
         if any(term in desc for term in WRITE_TERMS):
             field = "write_price"
             class_a_found += 1
-            logger.info(f"Write op: {desc} - {ppu}")
+            logger.info("Write op: %s - %s", desc, ppu)
         elif any(term in desc for term in READ_TERMS):
             field = "read_price"
             class_b_found += 1
-            logger.info(f"Read op: {desc} - {ppu}")
+            logger.info("Read op: %s - %s", desc, ppu)
         else:
             unclassified_found += 1
-            logger.info(f"Unclassified op: {desc}")
+            logger.info("Unclassified op: %s", desc)
             continue
 
         # Extract storage class from description
@@ -398,7 +366,7 @@ def process_operations_skus(skus, records, region_types):
         
         if storage_class is None:
             # Fall back to category
-            storage_class = normalize_class(cat.get("resourceGroup", ""))
+            storage_class = normalize_class(sku["category"].get("resourceGroup", ""))
         
         # Fix for 'durable reduced availability' -> map to STANDARD
         if "durable reduced availability" in desc:
@@ -406,7 +374,7 @@ def process_operations_skus(skus, records, region_types):
         
         # Determine region type from description
         region_type = extract_region_type(desc)
-        logger.info(f"Operation: {desc}, Class: {storage_class}, Region Type: {region_type}")
+        logger.info("Operation: %s, Class: %s, Region Type: %s", desc, storage_class, region_type)
         
         # Apply operation price to all matching regions of this type and storage class
         applied_count = 0
@@ -415,7 +383,7 @@ def process_operations_skus(skus, records, region_types):
         matching_regions = region_types.get(region_type, {}).get(storage_class, [])
         
         if not matching_regions:
-            logger.info(f"No matching regions found for {region_type} {storage_class}")
+            logger.info("No matching regions found for %s %s", region_type, storage_class)
             # Try a more flexible approach for regional
             if region_type == "regional":
                 for rt in region_types:
@@ -435,26 +403,22 @@ def process_operations_skus(skus, records, region_types):
                 else:
                     applied_read[key] = applied_read.get(key, 0) + 1
         
-        logger.info(f"Applied {field} to {applied_count} records for {storage_class} {region_type}")
+        logger.info("Applied %s to %d records for %s %s", field, applied_count, storage_class, region_type)
     
-    logger.info(f"Operations: {operations_found} total, {class_a_found} write, {class_b_found} read, {unclassified_found} unclassified")
-    logger.info(f"Applied write prices to {sum(applied_write.values())} records")
-    logger.info(f"Applied read prices to {sum(applied_read.values())} records")
+    logger.info("Operations: %d total, %d write, %d read, %d unclassified", operations_found, class_a_found, class_b_found, unclassified_found)
+    logger.info("Applied write prices to %d records", sum(applied_write.values()))
+    logger.info("Applied read prices to %d records", sum(applied_read.values()))
     
     return records
 
 def process_early_delete_skus(skus, records):
-    """Process early delete SKUs to add flat fees."""
+    """Process on-demand storage early delete SKUs to add flat fees."""
     early_delete_count = 0
     applied_count = 0
     
     logger.info("Processing early delete SKUs...")
     
     for sku in skus:
-        cat = sku.get("category", {})
-        if cat.get("resourceFamily") != "Storage" or cat.get("usageType") != "OnDemand":
-            continue
-
         desc = sku.get("description", "").lower()
         pe = sku["pricingInfo"][0]["pricingExpression"]
         unit = pe.get("usageUnit", "").lower()
@@ -478,7 +442,7 @@ def process_early_delete_skus(skus, records):
         
         if storage_class is None:
             # Fall back to category
-            storage_class = normalize_class(cat.get("resourceGroup", ""))
+            storage_class = normalize_class(sku["category"].get("resourceGroup", ""))
         
         # Fix for 'durable reduced availability' -> map to STANDARD
         if "durable reduced availability" in desc:
@@ -491,15 +455,23 @@ def process_early_delete_skus(skus, records):
                 rec["flat_item_price"] = fee
                 applied_count += 1
     
-    logger.info(f"Found {early_delete_count} early delete SKUs, applied to {applied_count} records")
+    logger.info("Found %d early delete SKUs, applied to %d records", early_delete_count, applied_count)
     return records
 
 def main():
     try:
         # Fetch all SKUs once and store in memory
-        logger.info(f"Starting GCP Storage pricing extraction...")
-        skus = list(fetch_all_skus())
-        logger.info(f"Fetched {len(skus)} total SKUs")
+        logger.info("Starting GCP Storage pricing extraction...")
+        all_skus = fetch_all_skus()
+        logger.info("Fetched %d total SKUs", len(all_skus))
+        
+        # Every pass only prices on-demand storage SKUs, so read each SKU's category once here
+        skus = []
+        for sku in all_skus:
+            cat = sku.get("category", {})
+            if cat.get("resourceFamily") == "Storage" and cat.get("usageType") == "OnDemand":
+                skus.append(sku)
+        logger.info("Kept %d on-demand storage SKUs", len(skus))
         
         # Process in three passes
         records, region_types = process_capacity_skus(skus)
@@ -511,9 +483,9 @@ def main():
         with_read = sum(1 for r in records.values() if r["read_price"] != "")
         with_early_delete = sum(1 for r in records.values() if r["flat_item_price"] != "")
         
-        logger.info(f"Records with write price: {with_write}/{len(records)}")
-        logger.info(f"Records with read price: {with_read}/{len(records)}")
-        logger.info(f"Records with early delete price: {with_early_delete}/{len(records)}")
+        logger.info("Records with write price: %d/%d", with_write, len(records))
+        logger.info("Records with read price: %d/%d", with_read, len(records))
+        logger.info("Records with early delete price: %d/%d", with_early_delete, len(records))
         
         # Ensure data directory exists
         data_dir = os.path.join(os.path.dirname(__file__), "data")
@@ -521,7 +493,7 @@ def main():
         
         # Check directory permissions
         if not check_directory_permissions(data_dir):
-            logger.error(f"Insufficient permissions to write to data directory: {data_dir}")
+            logger.error("Insufficient permissions to write to data directory: %s", data_dir)
             sys.exit(1)
         
         # Write CSV output to data folder
@@ -534,10 +506,10 @@ def main():
             w.writeheader()
             w.writerows(records.values())
         
-        logger.info(f"✅ Saved {len(records)} records to {outpath}")
+        logger.info("✅ Saved %d records to %s", len(records), outpath)
         
     except Exception as e:
-        logger.error(f"Error in main: {e}", exc_info=True)
+        logger.error("Error in main: %s", e, exc_info=True)
         sys.exit(1)
 
 if __name__ == "__main__":
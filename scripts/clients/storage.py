@@ -120,6 +120,12 @@ AZURE_REGION_MAPPING = {
     Region.ANTARCTICA: [], # remove—no such region in Azure
 }
 
+# Flattened Azure region code -> geographical region value, built once at import
+AZURE_REGION_TO_GEO = {}
+for _geo_region, _region_list in AZURE_REGION_MAPPING.items():
+    for _region_code, _region_name in _region_list:
+        AZURE_REGION_TO_GEO.setdefault(_region_code.lower(), _geo_region.value)
+
 # Access tier mapping based on your requirements
 ACCESS_TIER_MAPPING = {
     "hot": "FREQUENT_ACCESS",
@@ -158,17 +164,8 @@ def map_azure_region_to_geo(azure_region):
     if not azure_region:
         return None
         
-    # Convert to lowercase for consistent matching
-    azure_region = azure_region.lower()
-    
-    # Create region mapping for easier lookup
-    for geo_region, region_list in AZURE_REGION_MAPPING.items():
-        for region_code, region_name in region_list:
-            if azure_region == region_code.lower():
-                return geo_region.value
-    
-    # Return None if region not found in mapping
-    return None
+    # Convert to lowercase for consistent matching; None if region not in mapping
+    return AZURE_REGION_TO_GEO.get(azure_region.lower())
 
 def classify_and_normalize_azure_charge(item):
     """
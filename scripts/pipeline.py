@@ -1,20 +1,30 @@
 import asyncio
 import os
-import time
 import glob
-from typing import Optional
+from contextlib import asynccontextmanager, nullcontext
+from typing import Optional, Sequence
 from prisma import Prisma
-from scripts.utils.db_config import get_database_url, get_connection_params, format_connection_string
+from scripts.utils.db_config import get_database_url, get_connection_params, format_connection_string, with_pool_settings
 from scripts.utils.csv_loader import CSVBatchLoader
 from scripts.utils.transform_data_types import transform_vm_data, transform_storage_data
 
+# Tables fully reloaded by the pipeline (the @@map names from schema.prisma)
+BULK_LOADED_TABLES = ("on-demand-vm-pricing", "storage-pricing")
+
 class DatabaseConnection:
-    def __init__(self, connection_url: Optional[str] = None):
+    def __init__(
+        self,
+        connection_url: Optional[str] = None,
+        connection_limit: Optional[int] = None,
+        pool_timeout: Optional[int] = None,
+    ):
         """
         Initialize database connection with flexible configuration options.
         
         Args:
             connection_url: Optional explicit connection URL
+            connection_limit: Optional size of Prisma's connection pool
+            pool_timeout: Optional seconds a query waits for a pooled connection (0 waits indefinitely)
         """
         # Try explicit connection URL first
         self.connection_url = connection_url
@@ -34,6 +44,8 @@ class DatabaseConnection:
                     port=params["port"],
                     database=params["database"]
                 )
+        
+        self.connection_url = with_pool_settings(self.connection_url, connection_limit, pool_timeout)
                 
         # Override Prisma's database connection URL
         os.environ["DATABASE_URL"] = self.connection_url
@@ -67,7 +79,7 @@ class DatabaseConnection:
                 print(f"Connection failed: {str(e)}")
                 if attempt < retry_count:
                     print(f"Retrying in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
+                    await asyncio.sleep(retry_delay)
                 else:
                     raise ConnectionError(f"Failed to connect to database after {retry_count} attempts") from e
         
@@ -80,54 +92,123 @@ class DatabaseConnection:
             await self.prisma.disconnect()
         except Exception as e:
             print(f"Error during disconnect: {str(e)}")
+    
+    async def __aenter__(self):
+        """Connect when entering an async with block and return the Prisma client"""
+        return await self.connect()
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        """Disconnect when the async with block exits, even on error"""
+        await self.disconnect()
 
-async def run_pipeline():
-    # Initialize database connection
-    db = DatabaseConnection()
-    prisma = await db.connect()
-
+@asynccontextmanager
+async def without_secondary_indexes(prisma: Prisma, tables: Sequence[str]):
+    """
+    Drop the non-unique indexes on the given tables for the duration of the block.
+    
+    Building each index once over the loaded data is much cheaper than updating
+    it for every inserted row. The indexes are recreated on exit, even on error.
+    Only indexes in the connection's current schema are touched.
+    
+    Args:
+        prisma: Connected Prisma client
+        tables: Names of the database tables to strip indexes from
+    """
+    placeholders = ", ".join(f"${i}" for i in range(1, len(tables) + 1))
+    indexes = await prisma.query_raw(
+        f"""
+        SELECT schemaname, indexname, indexdef FROM pg_indexes
+        WHERE schemaname = current_schema()
+          AND tablename IN ({placeholders})
+          AND indexdef NOT LIKE 'CREATE UNIQUE INDEX%'
+        """,
+        *tables
+    )
+    
+    # Print every definition before dropping anything, so the indexes can be
+    # restored by hand if the process dies before they are recreated
+    print(f"Dropping {len(indexes)} secondary indexes before loading")
+    for index in indexes:
+        print(f"  {index['indexdef']}")
+    for index in indexes:
+        await prisma.execute_raw(f'DROP INDEX IF EXISTS "{index["schemaname"]}"."{index["indexname"]}"')
+    
     try:
+        yield
+    finally:
+        print(f"Recreating {len(indexes)} secondary indexes")
+        outcomes = await asyncio.gather(
+            *(prisma.execute_raw(index["indexdef"]) for index in indexes),
+            return_exceptions=True
+        )
+        for index, outcome in zip(indexes, outcomes):
+            if isinstance(outcome, Exception):
+                print(f"Failed to recreate index {index['indexname']}: {str(outcome)}")
+                print(f"  Recreate it manually with: {index['indexdef']}")
+
+async def run_pipeline(
+    manage_indexes: bool = True,
+    connection_limit: Optional[int] = None,
+    pool_timeout: Optional[int] = None,
+):
+    """
+    Reload the pricing tables from the CSV files in the data directory.
+    
+    Args:
+        manage_indexes: Drop the secondary indexes during the load and rebuild them afterwards
+        connection_limit: Size of Prisma's connection pool, or None for Prisma's default
+        pool_timeout: Seconds a query waits for a pooled connection (0 waits indefinitely),
+            or None for Prisma's default
+    """
+    # Pipeline starts here and generates csvs for each provider
+    # TODO: Implement pipeline
+    
+    # Define data directory
+    data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
+    
+    # Scan for all CSV files in the data directory
+    all_csv_files = glob.glob(os.path.join(data_dir, '*.csv'))
+    
+    # Categorize CSV files based on their endings
+    instances_configs = []
+    storage_configs = []
+    
+    for csv_file in all_csv_files:
+        filename = os.path.basename(csv_file)
+        
+        if filename.endswith('instances.csv'):
+            instances_configs.append({
+                'file_path': csv_file,
+                'model_name': 'ondemandvmpricing',
+                'transform_func': transform_vm_data
+            })
+            print(f"Found instances file: {filename}")
+            
+        elif filename.endswith('storage.csv'):
+            storage_configs.append({
+                'file_path': csv_file,
+                'model_name': 'storagepricing',
+                'transform_func': transform_storage_data
+            })
+            print(f"Found storage file: {filename}")
+    
+    # Combine all configurations
+    all_csv_configs = instances_configs + storage_configs
+    
+    # Database connection stays open for the whole pipeline and is closed on exit.
+    # The indexes are only worth dropping when there is something to load
+    async with DatabaseConnection(connection_limit=connection_limit, pool_timeout=pool_timeout) as prisma, (
+        without_secondary_indexes(prisma, BULK_LOADED_TABLES)
+        if manage_indexes and all_csv_configs else nullcontext()
+    ):
         # delete all data from the source table
         await prisma.ondemandvmpricing.delete_many()
         await prisma.storagepricing.delete_many()
         
-        # Pipeline starts here and generates csvs for each provider
-        # TODO: Implement pipeline
-        
-        # Initialize CSV batch loader
-        csv_loader = CSVBatchLoader(prisma, batch_size=200)
-        
-        # Define data directory
-        data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
-        
-        # Scan for all CSV files in the data directory
-        all_csv_files = glob.glob(os.path.join(data_dir, '*.csv'))
-        
-        # Categorize CSV files based on their endings
-        instances_configs = []
-        storage_configs = []
-        
-        for csv_file in all_csv_files:
-            filename = os.path.basename(csv_file)
-            
-            if filename.endswith('instances.csv'):
-                instances_configs.append({
-                    'file_path': csv_file,
-                    'model_name': 'ondemandvmpricing',
-                    'transform_func': transform_vm_data
-                })
-                print(f"Found instances file: {filename}")
-                
-            elif filename.endswith('storage.csv'):
-                storage_configs.append({
-                    'file_path': csv_file,
-                    'model_name': 'storagepricing',
-                    'transform_func': transform_storage_data
-                })
-                print(f"Found storage file: {filename}")
-        
-        # Combine all configurations
-        all_csv_configs = instances_configs + storage_configs
+        # Initialize CSV batch loader. Each batch is one multi-row INSERT, so larger
+        # batches mean fewer round trips; 2000 rows x 13 columns stays well under
+        # Postgres' 32767 bind-parameter limit
+        csv_loader = CSVBatchLoader(prisma, batch_size=2000)
         
         if all_csv_configs:
             print(f"\nLoading data from {len(all_csv_configs)} CSV files...")
@@ -144,8 +225,5 @@ async def run_pipeline():
         else:
             print("No CSV files found in the data directory.")
 
-    finally:
-        await db.disconnect()
-
 if __name__ == "__main__":
     asyncio.run(run_pipeline()) 
\ No newline at end of file
@@ -1,5 +1,6 @@
 import csv
 import asyncio
+import os
 from typing import List, Dict, Any, Optional, Callable
 from prisma import Prisma
 from pathlib import Path
@@ -11,16 +12,30 @@ class CSVBatchLoader:
     Supports batch processing and custom transformations.
     """
     
-    def __init__(self, prisma_client: Prisma, batch_size: int = 100):
+    def __init__(
+        self,
+        prisma_client: Prisma,
+        batch_size: int = 100,
+        max_parallel: Optional[int] = None,
+        insert_workers: int = 2,
+    ):
         """
         Initialize the CSV batch loader.
         
         Args:
             prisma_client: An initialized and connected Prisma client
             batch_size: Number of records to insert in a single batch operation
+            max_parallel: Maximum number of CSV files loaded at once. Defaults to the
+                CPU count, so that with two insert workers per file the concurrent
+                inserts stay within Prisma's default pool of 2 x CPUs + 1 connections
+            insert_workers: Number of batches of a single file inserted concurrently
         """
         self.prisma = prisma_client
         self.batch_size = batch_size
+        self.max_parallel = max_parallel or os.cpu_count() or 1
+        self.insert_workers = insert_workers
+        # Prisma model accessors by the name callers pass in, resolved on first use
+        self._models: Dict[str, Any] = {}
     
     async def load_csv(
         self,
@@ -33,6 +48,10 @@ class CSVBatchLoader:
         """
         Load data from a CSV file into the specified Prisma model.
         
+        Parsing and inserting overlap: batches are parsed into a bounded queue
+        while insert workers drain it, so the next batch is parsed during the
+        database round trip for the previous one.
+        
         Args:
             file_path: Path to the CSV file
             model_name: Name of the Prisma model to insert data into (e.g., 'awsinstancecompute')
@@ -53,33 +72,101 @@ class CSVBatchLoader:
             raise FileNotFoundError(f"CSV file not found: {file_path}")
         
         # Get the appropriate model from Prisma client
-        if not hasattr(self.prisma, model_name.lower()):
-            raise AttributeError(f"Model '{model_name}' not found in Prisma client")
+        model = self._get_model(model_name)
         
-        model = getattr(self.prisma, model_name.lower())
-        records_inserted = 0
+        # Bounded so parsing never runs more than a couple of batches ahead
+        queue = asyncio.Queue(maxsize=2 * self.insert_workers)
+        workers = [
+            asyncio.create_task(self._consume_batches(queue, model))
+            for _ in range(self.insert_workers)
+        ]
+        try:
+            await self._produce_batches(csv_path, queue, mapping, transform_func)
+        finally:
+            # Let the workers finish the queued batches, even if parsing failed
+            for _ in workers:
+                await queue.put(None)
+            counts = await asyncio.gather(*workers)
+        
+        return sum(counts)
+    
+    def _get_model(self, model_name: str) -> Any:
+        """
+        Look up a Prisma model accessor by name, caching it for later files.
+        
+        Args:
+            model_name: Name of the Prisma model (case-insensitive)
+            
+        Returns:
+            The Prisma model accessor
+            
+        Raises:
+            AttributeError: If the specified model doesn't exist in Prisma client
+        """
+        model = self._models.get(model_name)
+        if model is None:
+            model = getattr(self.prisma, model_name.lower(), None)
+            if model is None:
+                raise AttributeError(f"Model '{model_name}' not found in Prisma client")
+            self._models[model_name] = model
+        return model
+    
+    async def _produce_batches(
+        self,
+        csv_path: Path,
+        queue: asyncio.Queue,
+        mapping: Optional[Dict[str, str]],
+        transform_func: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]],
+    ):
+        """
+        Parse a CSV file into batches of records and put them on the queue.
+        
+        Args:
+            csv_path: Path to the CSV file
+            queue: Queue the insert workers read batches from
+            mapping: Optional mapping of CSV column names to database field names
+            transform_func: Optional function to transform each row before insertion
+        """
         batch = []
         
         # Read and process the CSV file
         with open(csv_path, 'r', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
+            reader = csv.reader(csvfile)
             
-            # Skip header if needed
-            if skip_header and not hasattr(reader, 'fieldnames'):
-                next(reader, None)
+            # The first row is always the header; it names the columns
+            header = next(reader, None)
+            if header is None:
+                return
+            
+            # Resolve the column mapping against the header once, so each row
+            # is built by position instead of through an intermediate dict
+            if mapping:
+                positions = {name: i for i, name in enumerate(header)}
+                columns = [(positions[csv_col], db_field)
+                           for csv_col, db_field in mapping.items() if csv_col in positions]
+                indices = [i for i, _ in columns]
+                fields = [db_field for _, db_field in columns]
+            else:
+                # Use data as-is if no mapping provided
+                indices = None
+                fields = header
+            width = len(header)
+            
+            # Bind attributes used on every row to locals once
+            batch_size = self.batch_size
             
             # Process each row
             for row in reader:
-                data = {}
+                # Skip blank lines and pad short rows, as csv.DictReader does
+                if not row:
+                    continue
+                if len(row) < width:
+                    row += [None] * (width - len(row))
                 
-                # Apply column mapping if provided
-                if mapping:
-                    for csv_col, db_field in mapping.items():
-                        if csv_col in row:
-                            data[db_field] = row[csv_col]
+                if indices is None:
+                    data = dict(zip(fields, row))
                 else:
-                    # Use data as-is if no mapping provided
-                    data = {k: v for k, v in row.items()}
+                    data = dict(zip(fields, [row[i] for i in indices]))
                 
                 # Apply custom transformation if provided
                 if transform_func:
@@ -87,18 +174,35 @@ class CSVBatchLoader:
                 
                 batch.append(data)
                 
-                # When batch size is reached, insert the batch
-                if len(batch) >= self.batch_size:
-                    await self._insert_batch(model, batch)
-                    records_inserted += len(batch)
+                # When batch size is reached, hand the batch to the insert workers
+                if len(batch) >= batch_size:
+                    await queue.put(batch)
                     batch = []
+                    # Give an idle worker the chance to start inserting before we parse on
+                    await asyncio.sleep(0)
             
-            # Insert any remaining records
+            # Queue any remaining records
             if batch:
-                await self._insert_batch(model, batch)
-                records_inserted += len(batch)
-                
-        return records_inserted
+                await queue.put(batch)
+    
+    async def _consume_batches(self, queue: asyncio.Queue, model: Any) -> int:
+        """
+        Insert batches from the queue until a None sentinel is received.
+        
+        Args:
+            queue: Queue of record batches produced by _produce_batches
+            model: Prisma model to insert into
+            
+        Returns:
+            Number of records handed to the database
+        """
+        records_inserted = 0
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                return records_inserted
+            await self._insert_batch(model, batch)
+            records_inserted += len(batch)
     
     async def _insert_batch(self, model: Any, batch: List[Dict[str, Any]]):
         """
@@ -113,12 +217,34 @@ class CSVBatchLoader:
             await model.create_many(data=batch)
         except Exception as e:
             print(f"Error inserting batch: {str(e)}")
-            # Fall back to individual inserts if batch insert fails
-            for item in batch:
-                try:
-                    await model.create(data=item)
-                except Exception as item_error:
-                    print(f"Error inserting item {item}: {str(item_error)}")
+            # Retry in halves to isolate the failing records
+            mid = len(batch) // 2
+            await self._insert_with_split(model, batch[:mid])
+            await self._insert_with_split(model, batch[mid:])
+    
+    async def _insert_with_split(self, model: Any, batch: List[Dict[str, Any]]):
+        """
+        Insert a batch, splitting it in half on failure until the bad records are isolated.
+        
+        A batch with k bad records takes O(k log n) queries instead of one per record.
+        The halves are retried one after the other so a batch full of bad records
+        can't flood the connection pool.
+        
+        Args:
+            model: Prisma model to insert into
+            batch: List of data dictionaries to insert
+        """
+        if not batch:
+            return
+        try:
+            await model.create_many(data=batch)
+        except Exception as e:
+            if len(batch) == 1:
+                print(f"Error inserting item {batch[0]}: {str(e)}")
+                return
+            mid = len(batch) // 2
+            await self._insert_with_split(model, batch[:mid])
+            await self._insert_with_split(model, batch[mid:])
 
     async def load_multiple_csvs(
         self,
@@ -135,32 +261,35 @@ class CSVBatchLoader:
         Returns:
             Dictionary mapping file paths to number of records inserted
         """
-        tasks = []
-        for config in csv_configs:
-            file_path = config['file_path']
-            model_name = config['model_name']
-            mapping = config.get('mapping')
-            transform_func = config.get('transform_func')
-            skip_header = config.get('skip_header', True)
-            
-            task = asyncio.create_task(
-                self.load_csv(
-                    file_path=file_path,
-                    model_name=model_name,
-                    mapping=mapping,
-                    transform_func=transform_func,
-                    skip_header=skip_header
+        # Cap the number of files loading at once so their batches don't queue
+        # behind each other waiting for a free connection in Prisma's pool
+        semaphore = asyncio.Semaphore(self.max_parallel)
+        
+        async def load_with_limit(config: Dict[str, Any]) -> int:
+            async with semaphore:
+                return await self.load_csv(
+                    file_path=config['file_path'],
+                    model_name=config['model_name'],
+                    mapping=config.get('mapping'),
+                    transform_func=config.get('transform_func'),
+                    skip_header=config.get('skip_header', True)
                 )
-            )
-            tasks.append((file_path, task))
+        
+        # A failure in one file doesn't hold up or cancel the others
+        outcomes = await asyncio.gather(
+            *(load_with_limit(config) for config in csv_configs),
+            return_exceptions=True
+        )
         
         results = {}
-        for file_path, task in tasks:
-            try:
-                records = await task
-                results[file_path] = records
-            except Exception as e:
-                print(f"Error loading {file_path}: {str(e)}")
+        for config, outcome in zip(csv_configs, outcomes):
+            file_path = config['file_path']
+            if isinstance(outcome, Exception):
+                print(f"Error loading {file_path}: {str(outcome)}")
                 results[file_path] = 0
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                results[file_path] = outcome
                 
         return results 
\ No newline at end of file
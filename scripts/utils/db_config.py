@@ -2,11 +2,31 @@
 Database configuration utilities.
 """
 import os
-from urllib.parse import urlparse, ParseResult
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Optional
+from urllib.parse import urlparse, urlencode, parse_qsl, ParseResult
 
 import dotenv
 
-dotenv.load_dotenv()
+
+@lru_cache(maxsize=1)
+def _settings() -> Mapping[str, Optional[str]]:
+    """
+    Load .env and read the database settings from the environment, once per process.
+    
+    Returns:
+        Mapping: Read-only view of the database-related environment variables
+    """
+    dotenv.load_dotenv(override=False)
+    return MappingProxyType({
+        "DATABASE_URL": os.environ.get("DATABASE_URL"),
+        "DB_HOST": os.getenv("DB_HOST"),
+        "DB_PORT": os.getenv("DB_PORT", "5432"),
+        "DB_USER": os.getenv("DB_USER"),
+        "DB_PASSWORD": os.getenv("DB_PASSWORD"),
+        "DB_NAME": os.getenv("DB_NAME"),
+    })
 
 
 def get_database_url() -> str:
@@ -19,7 +39,7 @@ def get_database_url() -> str:
     Raises:
         ValueError: If DATABASE_URL is not set
     """
-    database_url = os.environ.get("DATABASE_URL")
+    database_url = _settings()["DATABASE_URL"]
     if not database_url:
         raise ValueError("DATABASE_URL environment variable is required")
     return database_url
@@ -54,6 +74,37 @@ def format_connection_string(
     return f"postgresql://{user}:{password}@{host}:{port}/{database}"
 
 
+def with_pool_settings(
+    url: str, connection_limit: Optional[int] = None, pool_timeout: Optional[int] = None
+) -> str:
+    """
+    Add Prisma connection pool settings to a connection string.
+    
+    Existing query parameters are kept; the given settings replace any already present.
+    connection_limit should stay at or below Postgres' max_connections divided by the
+    number of clients that connect at the same time.
+    
+    Args:
+        url: Database connection string
+        connection_limit: Maximum number of pooled connections, or None for Prisma's default
+        pool_timeout: Seconds a query waits for a free connection (0 waits indefinitely),
+            or None for Prisma's default
+        
+    Returns:
+        str: Connection string with the pool settings applied
+    """
+    if connection_limit is None and pool_timeout is None:
+        return url
+    
+    parsed = urlparse(url)
+    query = dict(parse_qsl(parsed.query, keep_blank_values=True))
+    if connection_limit is not None:
+        query["connection_limit"] = str(connection_limit)
+    if pool_timeout is not None:
+        query["pool_timeout"] = str(pool_timeout)
+    return parsed._replace(query=urlencode(query)).geturl()
+
+
 def get_connection_params() -> dict:
     """
     Get database connection parameters from the environment.
@@ -62,17 +113,12 @@ def get_connection_params() -> dict:
         dict: Database connection parameters
     """
     # Try to get individual components first
-    db_host = os.getenv("DB_HOST")
-    db_port = os.getenv("DB_PORT", "5432")
-    db_user = os.getenv("DB_USER")
-    db_pass = os.getenv("DB_PASSWORD")
-    db_name = os.getenv("DB_NAME")
-    
-    print(f"DB_HOST: {db_host}")
-    print(f"DB_PORT: {db_port}")
-    print(f"DB_USER: {db_user}")
-    print(f"DB_PASSWORD: {db_pass}")
-    print(f"DB_NAME: {db_name}")
+    settings = _settings()
+    db_host = settings["DB_HOST"]
+    db_port = settings["DB_PORT"]
+    db_user = settings["DB_USER"]
+    db_pass = settings["DB_PASSWORD"]
+    db_name = settings["DB_NAME"]
     
     # If all components are available, use them
     if all([db_host, db_user, db_pass, db_name]):
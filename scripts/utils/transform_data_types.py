@@ -3,6 +3,18 @@ This module contains functions to transform data types from the CSV files to the
 '''
 
 
+def safe_float_convert(value):
+    '''
+    Convert a CSV value to float, returning None for empty, 'None' or unparseable values.
+    '''
+    if value is None or value == '' or value == 'None':
+        return None
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
 def transform_vm_data(row):
     '''
     Transform the data types from the CSV files to the correct types for the database.
@@ -12,7 +24,6 @@ def transform_vm_data(row):
     row['price_per_hour_usd'] = float(row['price_per_hour_usd'])
     row['gpu_count'] = int(row['gpu_count'])
     row['gpu_memory'] = float(row['gpu_memory'])
-    row['provider_name'] = row['provider_name']
     row['os_type'] = row['os_type'].strip()
     row['region'] = row['region'].strip()
 
@@ -24,14 +35,6 @@ def transform_storage_data(row):
     Transform the data types from storage CSV files to the correct types for the database.
     '''
     # Convert numeric fields, handling empty strings and None values
-    def safe_float_convert(value):
-        if value is None or value == '' or value == 'None':
-            return None
-        try:
-            return float(value)
-        except (ValueError, TypeError):
-            return None
-    
     row['capacity_price'] = safe_float_convert(row.get('capacity_price'))
     row['read_price'] = safe_float_convert(row.get('read_price'))
     row['write_price'] = safe_float_convert(row.get('write_price'))